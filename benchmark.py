@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Generates synthetic books_*.md catalogs and times parsing, export, report and
+duplicate fixing on them. Every stage runs in a fresh process on a fresh copy of
+the catalog, and wall time, peak RSS and file I/O are recorded to a JSON baseline.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from catalog_parser import LETTERS
+
+# Catalog sizes by total entries -> entries per letter file
+CATALOG_SIZES = {
+    '2.6k': 100,
+    '260k': 10000,
+    '2.6m': 100000,
+}
+
+STAGES = [
+    'process_all_files',
+    'save_to_csv',
+    'generate_analysis_report',
+    'fix_duplicates',
+    'eliminate_all_duplicates',
+]
+
+DEFAULT_BASELINE_FILE = 'benchmark_baseline.json'
+DEFAULT_DUPLICATE_RATE = 0.01
+DEFAULT_TOLERANCE = 0.2
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ren', 'sa', 'tor', 'vi', 'del', 'an', 'bru',
+             'cor', 'es', 'fin', 'gal', 'hu', 'is', 'jor', 'ne', 'ol', 'pra']
+TITLE_WORDS = ['Secret', 'History', 'Love', 'Murder', 'Mystery', 'Dragon', 'Science',
+               'War', 'Garden', 'Journey', 'Life', 'Magic', 'Night', 'River', 'Empire',
+               'Letters', 'Universe', 'Kingdom', 'Shadow', 'Memoir']
+FIRST_NAMES = ['Anna', 'Ben', 'Clara', 'David', 'Elena', 'Frank', 'Grace', 'Hugo', 'Iris',
+               'James', 'Kate', 'Leo', 'Maya', 'Noah', 'Olga', 'Paul', 'Rosa', 'Sam']
+LAST_NAMES = ['Adams', 'Brooks', 'Chen', 'Diaz', 'Evans', 'Fischer', 'Garcia', 'Hughes',
+              'Ito', 'Jones', 'Klein', 'Lopez', 'Moreau', 'Novak', 'Okafor', 'Petrov']
+
+RECENT_TITLES = 10000  # duplicates are drawn from this many earlier entries
+
+
+def serial_word(number: int) -> str:
+    """A pronounceable word that is unique for every number."""
+    word = ''
+    while True:
+        number, digit = divmod(number, len(SYLLABLES))
+        word += SYLLABLES[digit]
+        if not number:
+            return word
+
+
+def generate_catalog(directory: str, per_letter: int,
+                     duplicate_rate: float = DEFAULT_DUPLICATE_RATE, seed: int = 42) -> int:
+    """Write books_A.md .. books_Z.md with per_letter entries each; returns the entry count.
+
+    Titles are unique by construction except for a duplicate_rate share of
+    entries that repeat an earlier title (and its author), possibly from
+    another letter, like the real catalog's cross-letter duplicates.
+    """
+    rnd = random.Random(seed)
+    recent = []
+    serial = 0
+
+    for letter in LETTERS:
+        with open(os.path.join(directory, f'books_{letter}.md'), 'w', encoding='utf-8') as file:
+            file.write(f"# {per_letter} Books Starting with Letter {letter}\n\n")
+
+            for entry_number in range(1, per_letter + 1):
+                if recent and rnd.random() < duplicate_rate:
+                    title, author = rnd.choice(recent)
+                else:
+                    serial += 1
+                    words = rnd.sample(TITLE_WORDS, rnd.randint(0, 3))
+                    title = ' '.join([letter + serial_word(serial)] + words)
+                    middle = serial_word(rnd.randrange(serial // 2 + 1)).capitalize()
+                    author = f"{rnd.choice(FIRST_NAMES)} {middle} {rnd.choice(LAST_NAMES)}"
+
+                    if len(recent) < RECENT_TITLES:
+                        recent.append((title, author))
+                    else:
+                        recent[rnd.randrange(RECENT_TITLES)] = (title, author)
+
+                file.write(f"{entry_number}. {title} - {author}\n")
+
+    return per_letter * len(LETTERS)
+
+
+def read_io_counters() -> Dict[str, int]:
+    """Process I/O counters: /proc/self/io on Linux, block counts elsewhere."""
+    try:
+        with open('/proc/self/io', 'r') as file:
+            counters = dict(line.split(':') for line in file if ':' in line)
+        return {name: int(value) for name, value in counters.items()
+                if name in ('rchar', 'wchar', 'syscr', 'syscw', 'read_bytes', 'write_bytes')}
+    except OSError:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return {'inblock': usage.ru_inblock, 'oublock': usage.ru_oublock}
+
+
+def peak_rss_kb() -> int:
+    """Peak resident set size of this process in KB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux kilobytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def prepare_stage(stage: str) -> Callable[[], None]:
+    """Do the untimed setup for a stage and return the call to time."""
+    if stage in ('process_all_files', 'save_to_csv', 'generate_analysis_report'):
+        from book_data_converter import BookDataConverter
+
+        converter = BookDataConverter()
+        if stage == 'process_all_files':
+            return converter.process_all_files
+        converter.process_all_files()
+        return getattr(converter, stage)
+
+    if stage == 'fix_duplicates':
+        from duplicate_fixer import DuplicateFixer
+
+        fixer = DuplicateFixer()
+        fixer.load_all_books()
+        return fixer.fix_duplicates
+
+    if stage == 'eliminate_all_duplicates':
+        from zero_duplicates_fixer import ZeroDuplicatesFixer
+
+        fixer = ZeroDuplicatesFixer()
+        fixer.load_all_books()
+        return fixer.eliminate_all_duplicates
+
+    raise ValueError(f"Unknown stage: {stage}")
+
+
+def run_stage(stage: str) -> Dict:
+    """Time one stage in this process, with the catalog in the working directory."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        call = prepare_stage(stage)
+        rss_before = peak_rss_kb()
+        io_before = read_io_counters()
+
+        start = time.perf_counter()
+        call()
+        wall_time = time.perf_counter() - start
+
+        io_after = read_io_counters()
+
+    return {
+        'wall_time': round(wall_time, 4),
+        'peak_rss_kb': peak_rss_kb(),
+        'setup_peak_rss_kb': rss_before,
+        'io': {name: io_after[name] - io_before[name] for name in io_after},
+    }
+
+
+def run_stage_subprocess(stage: str, template_dir: str) -> Dict:
+    """Run a stage in a fresh interpreter on a fresh copy of the catalog."""
+    with tempfile.TemporaryDirectory(prefix='bench_run_') as work_dir:
+        catalog_dir = os.path.join(work_dir, 'catalog')
+        shutil.copytree(template_dir, catalog_dir)
+
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            filter(None, [os.path.dirname(os.path.abspath(__file__)), env.get('PYTHONPATH')]))
+
+        completed = subprocess.run([sys.executable, os.path.abspath(__file__), '--run-stage', stage],
+                                   cwd=catalog_dir, env=env, capture_output=True, text=True)
+
+    if completed.returncode != 0:
+        raise RuntimeError(f"{stage} failed:\n{completed.stderr}")
+
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_benchmarks(sizes: List[str], stages: List[str],
+                   duplicate_rate: float = DEFAULT_DUPLICATE_RATE, seed: int = 42) -> Dict:
+    """Generate each catalog size once and time every stage on it."""
+    baseline = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'duplicate_rate': duplicate_rate,
+        'seed': seed,
+        'results': {},
+    }
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix='bench_catalog_') as template_dir:
+            print(f"Generating {size} catalog...")
+            start = time.perf_counter()
+            entries = generate_catalog(template_dir, CATALOG_SIZES[size], duplicate_rate, seed)
+            print(f"  {entries} entries in {time.perf_counter() - start:.1f}s")
+
+            results = {'entries': entries, 'stages': {}}
+            for stage in stages:
+                result = run_stage_subprocess(stage, template_dir)
+                results['stages'][stage] = result
+                print(f"  {stage}: {result['wall_time']:.3f}s, "
+                      f"peak RSS {result['peak_rss_kb'] / 1024:.1f} MB")
+
+            baseline['results'][size] = results
+
+    return baseline
+
+
+def compare_baselines(previous: Dict, current: Dict,
+                      tolerance: float = DEFAULT_TOLERANCE) -> List[Tuple[str, str, str, float]]:
+    """Return (size, stage, metric, ratio) for metrics that grew by more than tolerance."""
+    regressions = []
+
+    for size, results in current['results'].items():
+        previous_stages = previous.get('results', {}).get(size, {}).get('stages', {})
+
+        for stage, result in results['stages'].items():
+            before = previous_stages.get(stage)
+            if not before:
+                continue
+
+            for metric in ('wall_time', 'peak_rss_kb'):
+                if before[metric] > 0:
+                    ratio = result[metric] / before[metric]
+                    if ratio > 1 + tolerance:
+                        regressions.append((size, stage, metric, ratio))
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the benchmark suite and write a JSON baseline; returns 1 on regressions."""
+    parser = argparse.ArgumentParser(description="Benchmark the converter and fixers on synthetic catalogs.")
+    parser.add_argument('--sizes', default='2.6k',
+                        help=f"comma-separated catalog sizes from {', '.join(CATALOG_SIZES)} (default: 2.6k)")
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help="comma-separated stages to time (default: all)")
+    parser.add_argument('--duplicate-rate', type=float, default=DEFAULT_DUPLICATE_RATE,
+                        help=f"share of entries repeating an earlier title (default: {DEFAULT_DUPLICATE_RATE})")
+    parser.add_argument('--seed', type=int, default=42, help="catalog generator seed (default: 42)")
+    parser.add_argument('--output', default=DEFAULT_BASELINE_FILE, metavar='PATH',
+                        help=f"where to write the results (default: {DEFAULT_BASELINE_FILE})")
+    parser.add_argument('--compare', metavar='PATH',
+                        help="previous baseline to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f"allowed growth before a metric counts as regressed (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument('--run-stage', choices=STAGES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_stage:
+        # Child process: the catalog copy is the working directory
+        print(json.dumps(run_stage(args.run_stage)))
+        return 0
+
+    sizes = [size.strip().lower() for size in args.sizes.split(',')]
+    stages = [stage.strip() for stage in args.stages.split(',')]
+    for name, known in (('size', CATALOG_SIZES), ('stage', STAGES)):
+        unknown = [value for value in (sizes if name == 'size' else stages) if value not in known]
+        if unknown:
+            parser.error(f"unknown {name}(s): {', '.join(unknown)}")
+
+    print("Book Database Benchmark Suite")
+    print("=" * 40)
+
+    baseline = run_benchmarks(sizes, stages, args.duplicate_rate, args.seed)
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(baseline, file, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        try:
+            with open(args.compare, 'r', encoding='utf-8') as file:
+                previous = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Error reading baseline {args.compare}: {e}")
+            return 1
+
+        regressions = compare_baselines(previous, baseline, args.tolerance)
+        if regressions:
+            print(f"\nWARNING: {len(regressions)} regression(s) against {args.compare}:")
+            for size, stage, metric, ratio in regressions:
+                print(f"  {size} {stage} {metric}: {ratio:.2f}x")
+            return 1
+        print(f"\nNo regressions against {args.compare}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,40 +5,55 @@ Converts the markdown book database files (A-Z) into structured CSV format for d
 """
 
 import os
-import re
-import csv
-import pandas as pd
-from pathlib import Path
-from typing import Dict, List, Set, Optional
-from collections import Counter
+import sys
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from genre_classifier import GenreClassifier
+from book_records import BookRow
+from build_cache import DEFAULT_CACHE_FILE, BuildCache
+from catalog_io import add_io_arguments, iter_catalog_reads
+from catalog_stats import CatalogStats
+from catalog_watch import DEFAULT_POLL_INTERVAL, CatalogWatcher
+from catalog_parser import BookRecord, catalog_files, iter_file_records, letter_from_path, parse_line
+from columnar_export import COLUMNAR_FORMATS, write_columnar
+from csv_export import CSV_COLUMNS, ExternalSorter, author_sort_key, write_csv
+from instrumentation import add_metrics_arguments, metrics, write_metrics
+from profiling import add_profile_arguments, run_profiled
+
+LETTER_COLUMN = CSV_COLUMNS.index('letter')
+ENTRY_NUMBER_COLUMN = CSV_COLUMNS.index('entry_number')
 
 class BookDataConverter:
-    def __init__(self):
+    def __init__(self, sketch: bool = False):
         self.books_data = []
+        self.file_spans = {}  # filepath -> (start, end) of its rows in books_data
         self.unique_authors = set()
+        self.stats = CatalogStats(sketch)  # fed as letters are added; the report reads it
         self.duplicate_titles = []
+        self.genre_classifier = GenreClassifier()
 
-    def parse_book_entry(self, line: str, letter: str) -> Optional[Dict]:
+    def parse_book_entry(self, line: str, letter: str) -> Optional[BookRow]:
         """Parse a single book entry from markdown format."""
-        line = line.strip()
+        record = parse_line(line, letter)
 
-        # Pattern: Number. Title - Author
-        pattern = r'^(\d+)\.\s+(.+?)\s+-\s+(.+)$'
-        match = re.match(pattern, line)
-
-        if not match:
+        if not record:
             return None
 
-        number, title, author = match.groups()
+        return self.book_from_record(record)
 
-        return {
-            'title': title.strip(),
-            'author': author.strip(),
-            'letter': letter.upper(),
-            'entry_number': int(number),
-            'title_length': len(title.strip()),
-            'author_last_name': self.extract_last_name(author.strip())
-        }
+    def book_from_record(self, record: BookRecord) -> BookRow:
+        """Build a book row from a parsed catalog record."""
+        return BookRow(
+            record.title,
+            record.author,
+            record.letter.upper(),
+            record.entry_number,
+            len(record.title),
+            self.extract_last_name(record.author)
+        )
 
     def extract_last_name(self, author: str) -> str:
         """Extract the last name from author for sorting purposes."""
@@ -52,93 +67,201 @@ class BookDataConverter:
 
     def extract_genre_hints(self, title: str, author: str) -> List[str]:
         """Extract possible genre hints from title and author."""
-        genres = []
-
-        title_lower = title.lower()
-        author_lower = author.lower()
-
-        # Genre indicators in titles
-        if any(word in title_lower for word in ['mystery', 'murder', 'detective', 'crime']):
-            genres.append('Mystery/Crime')
-        if any(word in title_lower for word in ['love', 'heart', 'romance']):
-            genres.append('Romance')
-        if any(word in title_lower for word in ['war', 'battle', 'soldier', 'army']):
-            genres.append('War/Military')
-        if any(word in title_lower for word in ['history', 'biography', 'life of', 'memoir']):
-            genres.append('Biography/History')
-        if any(word in title_lower for word in ['science', 'space', 'future', 'robot']):
-            genres.append('Science Fiction')
-        if any(word in title_lower for word in ['magic', 'dragon', 'wizard', 'fantasy']):
-            genres.append('Fantasy')
-        if any(word in title_lower for word in ['children', 'kid', 'little']):
-            genres.append('Children')
-
-        # Well-known genre authors
-        if any(name in author_lower for name in ['christie', 'doyle', 'chandler']):
-            genres.append('Mystery/Crime')
-        if any(name in author_lower for name in ['asimov', 'bradbury', 'clarke']):
-            genres.append('Science Fiction')
-        if any(name in author_lower for name in ['tolkien', 'lewis', 'gaiman']):
-            genres.append('Fantasy')
-        if any(name in author_lower for name in ['seuss', 'dahl', 'potter']):
-            genres.append('Children')
-
-        return genres if genres else ['General Fiction']
-
-    def process_file(self, filepath: str) -> List[Dict]:
-        """Process a single markdown file and extract book data."""
-        filename = os.path.basename(filepath)
-
-        # Extract letter from filename (books_A.md -> A)
-        if not filename.startswith('books_') or not filename.endswith('.md'):
-            return []
+        return self.genre_classifier.hints(title, author)
 
-        letter = filename.replace('books_', '').replace('.md', '')
-        books = []
+    def process_file(self, filepath: str, letter: Optional[str] = None) -> List[BookRow]:
+        """Process a single markdown file and extract book data.
 
-        try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                content = file.read()
-
-                for line in content.split('\n'):
-                    line = line.strip()
-
-                    # Parse book entries
-                    if re.match(r'^\d+\.', line):
-                        book = self.parse_book_entry(line, letter)
-                        if book:
-                            # Add genre hints
-                            book['genre_hints'] = ' | '.join(
-                                self.extract_genre_hints(book['title'], book['author'])
-                            )
-                            books.append(book)
+        letter is the manifest's letter for the file; without it the letter
+        comes from the file name (books_A.md -> A).
+        """
+        letter = letter or letter_from_path(filepath)
+        if letter is None:
+            return []
 
+        try:
+            return self.books_from_records(iter_file_records(filepath, letter))
         except Exception as e:
             print(f"Error processing {filepath}: {e}")
+            return []
+
+    def books_from_records(self, records: Iterable[BookRecord]) -> List[BookRow]:
+        """Build one letter file's rows from its parsed entries."""
+        books = [self.book_from_record(record) for record in records]
+
+        # Add genre hints for the whole file in one batched pass
+        genre_hints = self.genre_classifier.classify_many(
+            [book.title for book in books], [book.author for book in books]
+        )
+        for book, hints in zip(books, genre_hints):
+            book.genre_hints = sys.intern(hints)
 
         return books
 
-    def process_all_files(self) -> None:
-        """Process all book database files."""
-        current_dir = Path('.')
-
-        # Process files A-Z in order
-        for letter in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
-            file_path = current_dir / f'books_{letter}.md'
-            if file_path.exists():
-                print(f"Processing books_{letter}.md...")
-                books = self.process_file(str(file_path))
-                self.books_data.extend(books)
-                print(f"  Found {len(books)} entries")
+    def process_all_files(self, workers: Optional[int] = None,
+                          cache: Optional[BuildCache] = None, io_threads: Optional[int] = None) -> None:
+        """Process all book database files.
+
+        With workers > 1 the letter files are parsed in a process pool and
+        merged back in letter order, giving the same result as the serial path.
+        With io_threads the files are read concurrently through asyncio instead.
+        With a cache, letter files whose content is unchanged are not reparsed.
+        """
+        if io_threads:
+            asyncio.run(self.process_all_files_async(io_threads, cache))
+            return
+
+        for letter, filepath, books in self.iter_letter_books(workers, cache):
+            self._add_books(books, filepath)
+
+    async def process_all_files_async(self, io_threads: int, cache: Optional[BuildCache] = None) -> None:
+        """Process all book database files, reading them concurrently in worker threads."""
+        async for letter, filepath, books in self.iter_letter_books_async(io_threads, cache):
+            self._add_books(books, filepath)
+
+    def iter_letter_books(self, workers: Optional[int] = None,
+                          cache: Optional[BuildCache] = None) -> Iterator[Tuple[str, str, List[BookRow]]]:
+        """Yield (letter, filepath, books) for each letter file or shard, in catalog order."""
+        letters = {str(file_path): letter for letter, file_path in catalog_files()}  # catalog order
+        files = list(letters)
+        cached = {filepath: cache.get(filepath) for filepath in files} if cache else {}
+        pending = [filepath for filepath in files if cached.get(filepath) is None]
+        pending_letters = [letters[filepath] for filepath in pending]
+
+        executor = None
+        if workers and workers > 1 and pending:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            parsed = _merge_worker_metrics(executor.map(_process_catalog_file, pending, pending_letters))
+        else:
+            parsed = map(self.process_file, pending, pending_letters)
+
+        try:
+            # Process files in catalog order
+            for filepath in files:
+                print(f"Processing {os.path.basename(filepath)}...")
+                books = cached.get(filepath)
+                if books is None:
+                    books = next(parsed)
+                    if cache is not None:
+                        cache.put(filepath, books)
+                else:
+                    print("  Unchanged, using cached rows")
+                    metrics.count('files_cached')
+                yield letters[filepath], filepath, books
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if cache is not None:
+            cache.prune(files)
+            cache.save()
+
+    async def iter_letter_books_async(self, io_threads: int,
+                                      cache: Optional[BuildCache] = None) -> AsyncIterator[Tuple[str, str, List[BookRow]]]:
+        """Yield (letter, filepath, books) in catalog order, with all reads in flight at once."""
+        letters = {str(file_path): letter for letter, file_path in catalog_files()}  # catalog order
+        files = list(letters)
+        cached = {filepath: cache.get(filepath) for filepath in files} if cache else {}
+        pending = [filepath for filepath in files if cached.get(filepath) is None]
+        reads = iter_catalog_reads(threads=io_threads, files=pending)
+
+        try:
+            for filepath in files:
+                print(f"Processing {os.path.basename(filepath)}...")
+                books = cached.get(filepath)
+                if books is None:
+                    _, _, records = await reads.__anext__()
+                    try:
+                        books = self.books_from_records(await records)
+                    except Exception as e:
+                        print(f"Error processing {filepath}: {e}")
+                        books = []
+                    if cache is not None:
+                        cache.put(filepath, books)
+                else:
+                    print("  Unchanged, using cached rows")
+                    metrics.count('files_cached')
+                yield letters[filepath], filepath, books
+        finally:
+            await reads.aclose()
+
+        if cache is not None:
+            cache.prune(files)
+            cache.save()
+
+    def _add_books(self, books: List[BookRow], filepath: Optional[str] = None) -> None:
+        """Append one file's books and track unique authors."""
+        if filepath is not None:
+            self.file_spans[filepath] = (len(self.books_data), len(self.books_data) + len(books))
+        self.books_data.extend(books)
+        print(f"  Found {len(books)} entries")
+
+        # Track unique authors and the report statistics in the same pass
+        for book in books:
+            self.unique_authors.add(book.author)
+            self.stats.add(book)
+
+    def update_files(self, changed: Dict[str, Optional[str]],
+                     cache: Optional[BuildCache] = None) -> None:
+        """Reparse only the changed catalog files and patch their rows into books_data.
+
+        changed maps each file path to its letter, or to None when the file
+        was removed; every other file keeps its parsed rows.
+        """
+        file_books = {filepath: self.books_data[start:end]
+                      for filepath, (start, end) in self.file_spans.items()}
+
+        for filepath, letter in sorted(changed.items()):
+            if letter is None:
+                print(f"Removed {os.path.basename(filepath)}")
+                file_books.pop(filepath, None)
+                continue
+
+            print(f"Processing {os.path.basename(filepath)}...")
+            books = self.process_file(filepath, letter)
+            print(f"  Found {len(books)} entries")
+            file_books[filepath] = books
+            if cache is not None:
+                cache.put(filepath, books)
+
+        files = [str(file_path) for letter, file_path in catalog_files()]
+        self.books_data = []
+        self.file_spans = {}
+        for filepath in files:
+            books = file_books.get(filepath, [])
+            self.file_spans[filepath] = (len(self.books_data), len(self.books_data) + len(books))
+            self.books_data.extend(books)
 
-                # Track unique authors
-                for book in books:
-                    self.unique_authors.add(book['author'])
+        self.unique_authors = {book.author for book in self.books_data}
+        self.stats.reset()
+        self.stats.add_books(self.books_data)
+
+        if cache is not None:
+            cache.prune(files)
+            cache.save()
 
     def analyze_duplicates(self) -> Dict:
-        """Analyze duplicate titles and popular authors."""
-        title_counts = Counter(book['title'] for book in self.books_data)
-        author_counts = Counter(book['author'] for book in self.books_data)
+        """Analyze duplicate titles and popular authors.
+
+        In sketch mode the counts are Count-Min estimates (never low, at most
+        'count_error' high), duplicates are limited to the tracked top titles
+        whose estimate still exceeds 1 after subtracting that error,
+        and unique totals are HyperLogLog estimates within 'unique_error'.
+        """
+        title_counts = self.stats.title_counts
+        author_counts = self.stats.author_counts
+
+        if self.stats.sketch:
+            return {
+                'duplicate_titles': {title: count for title, count in title_counts.most_common()
+                                     if title_counts.frequencies.lower_bound(count) > 1},
+                'popular_authors': author_counts.most_common(10),
+                'total_unique_titles': title_counts.unique(),
+                'total_unique_authors': author_counts.unique(),
+                'count_error': author_counts.frequencies.error_bound(),
+                'count_confidence': 1 - author_counts.frequencies.delta,
+                'unique_error': title_counts.distinct.relative_error()
+            }
 
         duplicates = {title: count for title, count in title_counts.items() if count > 1}
         popular_authors = author_counts.most_common(10)
@@ -156,31 +279,40 @@ class BookDataConverter:
             print("No data to save!")
             return
 
-        # Create main dataset
-        df = pd.DataFrame(self.books_data)
-
-        # Sort by letter and entry number
-        df = df.sort_values(['letter', 'entry_number'])
+        # Sort by letter and entry number (stable, like the pandas multi-column sort)
+        rows = sorted((book.as_row() for book in self.books_data),
+                      key=lambda row: (row[LETTER_COLUMN], row[ENTRY_NUMBER_COLUMN]))
 
-        df.to_csv(output_file, index=False, encoding='utf-8')
+        write_csv(output_file, rows)
 
         print(f"\nSuccessfully created CSV file:")
         print(f"  {output_file} ({len(self.books_data)} entries)")
 
         # Create author-focused dataset
         author_file = output_file.replace('.csv', '_by_authors.csv')
-        df_authors = df.sort_values(['author_last_name', 'author', 'title'])
-        df_authors.to_csv(author_file, index=False, encoding='utf-8')
+        write_csv(author_file, sorted(rows, key=author_sort_key))
 
         print(f"  {author_file} (sorted by author)")
 
-        # Print summary statistics
+        self.print_summary()
+
+    def print_summary(self) -> None:
+        """Print the summary statistics shown after export."""
         analysis = self.analyze_duplicates()
         print(f"\nSummary Statistics:")
-        print(f"  Total books: {len(self.books_data)}")
-        print(f"  Unique titles: {analysis['total_unique_titles']}")
-        print(f"  Unique authors: {analysis['total_unique_authors']}")
-        print(f"  Duplicate titles: {len(analysis['duplicate_titles'])}")
+        print(f"  Total books: {self.stats.books}")
+
+        if self.stats.sketch:
+            error = f"±{2 * analysis['unique_error']:.1%} at 95% confidence"
+            print(f"  Unique titles: ~{analysis['total_unique_titles']} ({error})")
+            print(f"  Unique authors: ~{analysis['total_unique_authors']} ({error})")
+            print(f"  Duplicate titles: {len(analysis['duplicate_titles'])} among the most frequent titles")
+            print(f"  Counts below are at most {analysis['count_error']} too high "
+                  f"({analysis['count_confidence']:.0%} confidence)")
+        else:
+            print(f"  Unique titles: {analysis['total_unique_titles']}")
+            print(f"  Unique authors: {analysis['total_unique_authors']}")
+            print(f"  Duplicate titles: {len(analysis['duplicate_titles'])}")
 
         if analysis['duplicate_titles']:
             print(f"\n  Most duplicated titles:")
@@ -192,56 +324,206 @@ class BookDataConverter:
         for author, count in analysis['popular_authors'][:5]:
             print(f"    {author}: {count} books")
 
-    def generate_analysis_report(self) -> None:
-        """Generate a comprehensive analysis report."""
+    def save_columnar(self, fmt: str = 'parquet', output_file: Optional[str] = None) -> None:
+        """Save processed data as a columnar Parquet or Arrow IPC file."""
         if not self.books_data:
+            print("No data to save!")
             return
 
-        df = pd.DataFrame(self.books_data)
+        output_file = output_file or 'book_database' + COLUMNAR_FORMATS[fmt]
+        books = sorted(self.books_data, key=lambda book: (book.letter, book.entry_number))
+
+        try:
+            write_columnar(books, output_file, fmt)
+        except ImportError:
+            print(f"\nSkipping {output_file}: pyarrow is required (pip install pyarrow)")
+            return
+
+        metrics.count_export(output_file)
+        print(f"  {output_file} ({fmt}, {len(books)} entries)")
+
+    def stream_to_csv(self, output_file: str = 'book_database.csv', workers: Optional[int] = None,
+                      run_size: int = 100000, cache: Optional[BuildCache] = None) -> None:
+        """Stream books to CSV letter by letter without keeping the catalog in memory.
+
+        Only one letter's rows (all of its shards) are held at a time, since
+        catalog_files() yields a letter's shards together; the author-sorted file is
+        produced with an external merge sort over runs of run_size rows.
+        """
+        author_file = output_file.replace('.csv', '_by_authors.csv')
+        sorter = ExternalSorter(author_sort_key, run_size)
+
+        def letter_rows(books):
+            # Stable sort over all of a letter's shards, like save_to_csv's sort
+            for book in sorted(books, key=lambda book: book.entry_number):
+                row = book.as_row()
+                sorter.add(row)
+                yield row
+
+        def rows():
+            # Entry numbers are not monotonic across a letter's shards, so each
+            # letter is buffered until its last shard has been read
+            current, letter_books = None, []
+            for letter, filepath, books in self.iter_letter_books(workers, cache):
+                print(f"  Found {len(books)} entries")
+                if self.stats.sketch:
+                    # Fixed-size sketches keep the report within bounded memory too
+                    self.stats.add_books(books)
+                if letter != current:
+                    yield from letter_rows(letter_books)
+                    current, letter_books = letter, []
+                letter_books.extend(books)
+            yield from letter_rows(letter_books)
+
+        try:
+            total = write_csv(output_file, rows())
+            if not total:
+                print("No data to save!")
+                os.remove(output_file)
+                return
+
+            print(f"\nSuccessfully created CSV file:")
+            print(f"  {output_file} ({total} entries)")
+
+            write_csv(author_file, sorter.sorted_rows())
+            print(f"  {author_file} (sorted by author)")
+        finally:
+            sorter.close()
+
+        if self.stats.sketch:
+            self.print_summary()
+        else:
+            print(f"\nSummary Statistics:")
+            print(f"  Total books: {total}")
+
+    def generate_analysis_report(self) -> None:
+        """Generate a comprehensive analysis report."""
+        if not self.stats.books:
+            return
 
         print(f"\nDetailed Analysis Report:")
+        stats = self.stats
 
         # Books per letter
         print(f"  Books by Starting Letter:")
-        letter_counts = df['letter'].value_counts().sort_index()
-        for letter, count in letter_counts.items():
+        for letter, count in sorted(stats.letter_counts.items()):
             print(f"    {letter}: {count}")
 
-        # Title length analysis
-        avg_title_length = df['title_length'].mean()
-        max_title = df.loc[df['title_length'].idxmax()]
-        min_title = df.loc[df['title_length'].idxmin()]
-
+        # Title length analysis (max/min keep the first book, like idxmax/idxmin)
         print(f"\n  Title Length Analysis:")
-        print(f"    Average title length: {avg_title_length:.1f} characters")
-        print(f"    Longest title: '{max_title['title']}' ({max_title['title_length']} chars)")
-        print(f"    Shortest title: '{min_title['title']}' ({min_title['title_length']} chars)")
+        print(f"    Average title length: {stats.mean_title_length:.1f} characters")
+        print(f"    Longest title: '{stats.longest.title}' ({stats.longest.title_length} chars)")
+        print(f"    Shortest title: '{stats.shortest.title}' ({stats.shortest.title_length} chars)")
 
         # Genre distribution
-        genre_counts = Counter()
-        for book in self.books_data:
-            for genre in book['genre_hints'].split(' | '):
-                genre_counts[genre.strip()] += 1
-
         print(f"\n  Estimated Genre Distribution:")
-        for genre, count in genre_counts.most_common(8):
+        for genre, count in stats.genre_counts.most_common(8):
             print(f"    {genre}: {count} books")
 
-def main():
-    """Main function to run the converter."""
+    def generate_advanced_report(self) -> None:
+        """Extra pandas-based breakdowns; pandas is only imported here."""
+        if not self.books_data:
+            return
+
+        try:
+            import pandas as pd
+        except ImportError:
+            print("\nSkipping advanced report: pandas is required (pip install pandas)")
+            return
+
+        df = pd.DataFrame([book.as_row() for book in self.books_data], columns=CSV_COLUMNS)
+
+        print(f"\nAdvanced Analysis Report:")
+
+        print(f"  Title Length by Letter:")
+        lengths = df.groupby('letter')['title_length'].agg(['mean', 'median', 'min', 'max'])
+        for letter, row in lengths.iterrows():
+            print(f"    {letter}: mean {row['mean']:.1f}, median {row['median']:.1f}, "
+                  f"range {int(row['min'])}-{int(row['max'])}")
+
+        print(f"\n  Books per Author:")
+        books_per_author = df['author'].value_counts()
+        print(f"    Mean: {books_per_author.mean():.2f}, "
+              f"authors with one book: {(books_per_author == 1).sum()}")
+
+        print(f"\n  Top Genre by Letter:")
+        genres = df.assign(genre=df['genre_hints'].str.split(' | ', regex=False)).explode('genre')
+        top_genres = genres.groupby('letter')['genre'].agg(lambda column: column.value_counts().index[0])
+        for letter, genre in top_genres.items():
+            print(f"    {letter}: {genre}")
+
+def _process_catalog_file(filepath: str, letter: str) -> Tuple[List[BookRow], Dict[str, int]]:
+    """Process one letter file in a worker process; returns (books, counters)."""
+    metrics.reset()
+    books = BookDataConverter().process_file(filepath, letter)
+    return books, dict(metrics.counters)
+
+def _merge_worker_metrics(results: Iterator[Tuple[List[BookRow], Dict[str, int]]]) -> Iterator[List[BookRow]]:
+    """Fold each worker's counters into this process's metrics as its books arrive."""
+    for books, counters in results:
+        metrics.merge(counters)
+        yield books
+
+def export_all(converter: BookDataConverter, args) -> None:
+    """Write the CSVs, optional columnar files and the analysis report."""
+    # Save to CSV
+    with metrics.phase('export'):
+        converter.save_to_csv()
+
+        # Optional columnar exports
+        for fmt in args.columnar:
+            converter.save_columnar(fmt)
+
+    # Generate analysis report
+    with metrics.phase('report'):
+        converter.generate_analysis_report()
+
+        if args.advanced_report:
+            converter.generate_advanced_report()
+
+def watch(converter: BookDataConverter, watcher: CatalogWatcher, args,
+          cache: Optional[BuildCache] = None) -> None:
+    """Re-export after every change, reparsing only the edited letters, until interrupted."""
+    print(f"\nWatching books_*.md every {watcher.interval:g}s (Ctrl+C to stop)...")
+
+    try:
+        for changed in watcher.changes():
+            metrics.reset()
+            print(f"\nChanged: {', '.join(sorted(os.path.basename(filepath) for filepath in changed))}")
+
+            with metrics.phase('load'):
+                converter.update_files(changed, cache)
+            export_all(converter, args)
+
+            write_metrics(args, 'book_data_converter')
+            print(f"\nWatching books_*.md every {watcher.interval:g}s (Ctrl+C to stop)...")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+def run(args):
+    """Run the conversion with parsed command-line arguments."""
     print("Book Database to CSV Converter")
     print("=" * 40)
 
-    converter = BookDataConverter()
+    converter = BookDataConverter(sketch=args.sketch)
+    cache = BuildCache(args.cache) if args.cache else None
+    # Started before the first load so no edit slips between load and watch
+    watcher = CatalogWatcher(interval=args.watch_interval) if args.watch else None
 
-    # Process all files
-    converter.process_all_files()
+    if args.stream:
+        # Parse and write in one pass, never holding the whole catalog
+        with metrics.phase('export'):
+            converter.stream_to_csv(workers=args.workers, run_size=args.run_size, cache=cache)
 
-    # Save to CSV
-    converter.save_to_csv()
+        if args.sketch:
+            with metrics.phase('report'):
+                converter.generate_analysis_report()
+    else:
+        # Process all files
+        with metrics.phase('load'):
+            converter.process_all_files(workers=args.workers, cache=cache, io_threads=args.io_threads)
 
-    # Generate analysis report
-    converter.generate_analysis_report()
+        export_all(converter, args)
 
     print("\nConversion completed successfully!")
     print("\nFiles created:")
@@ -249,5 +531,49 @@ def main():
     print("  - book_database_by_authors.csv - All books sorted by author")
     print("\nThese CSV files are now ready for data analysis and research!")
 
+    write_metrics(args, 'book_data_converter')
+
+    if watcher is not None:
+        watch(converter, watcher, args, cache)
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to run the converter."""
+    parser = argparse.ArgumentParser(description="Convert the markdown book database files into CSV.")
+    parser.add_argument('--workers', type=int, default=None, metavar='N',
+                        help="parse letter files in N worker processes (default: serial)")
+    parser.add_argument('--stream', action='store_true',
+                        help="write the CSVs letter by letter with bounded memory (no report unless --sketch)")
+    parser.add_argument('--run-size', type=int, default=100000, metavar='ROWS',
+                        help="rows per sorted run for the streaming author sort (default: 100000)")
+    parser.add_argument('--columnar', choices=sorted(COLUMNAR_FORMATS), action='append', default=[],
+                        help="also export book_database.parquet / .arrow (requires pyarrow)")
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_FILE, default=None, metavar='PATH',
+                        help=f"reuse parsed rows of unchanged letter files (default path: {DEFAULT_CACHE_FILE})")
+    parser.add_argument('--advanced-report', action='store_true',
+                        help="add pandas-based breakdowns to the analysis report (requires pandas)")
+    parser.add_argument('--sketch', action='store_true',
+                        help="approximate title/author statistics with Count-Min and HyperLogLog "
+                             "sketches in fixed memory")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and re-export whenever a books_*.md file changes")
+    parser.add_argument('--watch-interval', type=float, default=DEFAULT_POLL_INTERVAL, metavar='SECONDS',
+                        help=f"how often --watch polls the letter files (default: {DEFAULT_POLL_INTERVAL:g})")
+    add_io_arguments(parser)
+    add_metrics_arguments(parser)
+    add_profile_arguments(parser, 'book_data_converter')
+    args = parser.parse_args(argv)
+
+    if args.watch and args.stream:
+        parser.error("--watch keeps the catalog in memory and cannot be combined with --stream")
+
+    if args.stream and (args.columnar or args.advanced_report):
+        parser.error("--columnar and --advanced-report need the whole catalog and cannot be "
+                     "combined with --stream")
+
+    if args.io_threads and (args.workers or args.stream):
+        parser.error("--io-threads cannot be combined with --workers or --stream")
+
+    run_profiled(args.profile, run, args)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Book Records
+Compact __slots__ records shared by the converter and the fixers. Author, letter
+and genre strings are interned, and file paths are stored once in a table and
+referenced by integer id, so a large catalog costs a few small objects per entry.
+"""
+
+import sys
+from operator import attrgetter
+from typing import List
+
+from csv_export import CSV_COLUMNS
+
+intern = sys.intern
+
+
+class FileTable:
+    """Catalog file paths <-> small integer ids."""
+
+    def __init__(self):
+        self.paths = []
+        self.ids = {}  # path -> id
+
+    def id_for(self, path) -> int:
+        path = str(path)
+        file_id = self.ids.get(path)
+        if file_id is None:
+            file_id = self.ids[path] = len(self.paths)
+            self.paths.append(path)
+        return file_id
+
+    def path(self, file_id: int) -> str:
+        return self.paths[file_id]
+
+
+# Process-wide table; locations only keep the id
+FILES = FileTable()
+
+
+_row_values = attrgetter(*CSV_COLUMNS)
+
+
+class BookRow:
+    """One converter row, with fields in CSV column order."""
+
+    __slots__ = tuple(CSV_COLUMNS)
+
+    def __init__(self, title: str, author: str, letter: str, entry_number: int,
+                 title_length: int, author_last_name: str, genre_hints: str = ''):
+        self.title = title
+        self.author = intern(author)
+        self.letter = intern(letter)
+        self.entry_number = entry_number
+        self.title_length = title_length
+        self.author_last_name = intern(author_last_name)
+        self.genre_hints = intern(genre_hints)
+
+    def as_row(self) -> List:
+        """Field values in CSV column order."""
+        return list(_row_values(self))
+
+    def __getstate__(self):
+        return _row_values(self)
+
+    def __setstate__(self, state) -> None:
+        self.__init__(*state)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BookRow):
+            return NotImplemented
+        return _row_values(self) == _row_values(other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"BookRow{_row_values(self)!r}"
+
+
+class Location:
+    """Where one catalog entry lives; the path is resolved through FILES."""
+
+    __slots__ = ('file_id', 'line_number', 'letter', 'entry_number', 'author')
+
+    def __init__(self, file_id: int, line_number: int, letter: str, entry_number: int, author: str):
+        self.file_id = file_id
+        self.line_number = line_number
+        self.letter = intern(letter)
+        self.entry_number = entry_number
+        self.author = intern(author)
+
+    @classmethod
+    def at(cls, path, line_number: int, letter: str, entry_number: int, author: str) -> 'Location':
+        return cls(FILES.id_for(path), line_number, letter, entry_number, author)
+
+    @property
+    def file(self) -> str:
+        return FILES.path(self.file_id)
+
+    def with_author(self, author: str) -> 'Location':
+        """Copy of this location with a new author, e.g. after a replacement."""
+        return Location(self.file_id, self.line_number, self.letter, self.entry_number, author)
+
+    def _key(self) -> tuple:
+        return (self.file_id, self.line_number, self.letter, self.entry_number, self.author)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Location):
+            return NotImplemented
+        return self._key() == other._key()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Location({self.file!r}, {self.line_number}, {self.letter!r}, {self.entry_number}, {self.author!r})"
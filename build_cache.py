@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Build Cache
+Per-file cache of parsed book rows keyed on content hash, so unchanged letter files are not reparsed.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+from book_records import BookRow
+from csv_export import CSV_COLUMNS
+from genre_classifier import GENRE_RULES
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_FILE = '.book_data_cache.json'
+
+
+def rules_fingerprint() -> str:
+    """Changes whenever the cache format or genre rules change."""
+    payload = json.dumps([CACHE_VERSION, CSV_COLUMNS, GENRE_RULES])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def file_sha256(filepath: str) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildCache:
+    def __init__(self, path: str = DEFAULT_CACHE_FILE):
+        self.path = path
+        self.fingerprint = rules_fingerprint()
+        self.entries = {}  # filepath -> {'sha256', 'mtime_ns', 'size', 'rows'}
+        self.stamps = {}  # filepath -> stamp computed by the last lookup
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self) -> None:
+        """Load the cache file; a missing, corrupt or stale cache starts empty."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if data.get('fingerprint') == self.fingerprint:
+            self.entries = data.get('files', {})
+
+    def save(self) -> None:
+        """Write the cache atomically."""
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({'fingerprint': self.fingerprint, 'files': self.entries},
+                      file, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, self.path)
+
+    def _stamp(self, filepath: str) -> Dict:
+        """mtime/size for a cheap check, content hash only when they moved."""
+        stat = os.stat(filepath)
+        entry = self.entries.get(filepath)
+
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            sha256 = entry['sha256']
+        else:
+            sha256 = file_sha256(filepath)
+
+        return {'sha256': sha256, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+    def get(self, filepath: str) -> Optional[List[BookRow]]:
+        """Return cached books for filepath if its content is unchanged."""
+        stamp = self._stamp(filepath)
+        self.stamps[filepath] = stamp
+        entry = self.entries.get(filepath)
+
+        if entry is None or entry['sha256'] != stamp['sha256']:
+            self.misses += 1
+            return None
+
+        # Same content, possibly touched: refresh the cheap check
+        entry.update(stamp)
+        self.hits += 1
+        return [BookRow(*row) for row in entry['rows']]
+
+    def put(self, filepath: str, books: List[BookRow]) -> None:
+        """Store books parsed from filepath under the stamp seen by get()."""
+        stamp = self.stamps.pop(filepath, None) or self._stamp(filepath)
+        stamp['rows'] = [book.as_row() for book in books]
+        self.entries[filepath] = stamp
+
+    def prune(self, filepaths: List[str]) -> None:
+        """Drop entries for files that are no longer part of the catalog."""
+        keep = set(filepaths)
+        self.entries = {path: entry for path, entry in self.entries.items() if path in keep}
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Candidate Store
+Replacement books shared by every fixer, loaded once from
+replacement_candidates.json. Entries are split into title and author on load
+and indexed by starting letter, title and author, so a fixer asking for unused
+candidates of one letter never rescans the others, and a name that becomes
+taken retires exactly the candidates that use it.
+"""
+
+import json
+import os
+from typing import Container, Dict, Iterator, List, NamedTuple, Optional
+
+from replacement_pool import LazyCategory
+
+DEFAULT_CANDIDATES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                       'replacement_candidates.json')
+
+
+class Candidate(NamedTuple):
+    letter: str
+    title: str
+    author: str
+
+    @property
+    def line(self) -> str:
+        return f"{self.title} - {self.author}"
+
+
+def title_letter(title: str) -> str:
+    """Letter a title is filed under; a leading "The " is skipped."""
+    if title.startswith('The '):
+        title = title[4:]
+    return title[:1].upper()
+
+
+def parse_candidate(book: str, letter: Optional[str] = None) -> Optional[Candidate]:
+    """Candidate from "Title - Author", or None if malformed."""
+    if " - " not in book:
+        return None
+
+    parts = book.split(" - ")
+    title, author = parts[0].strip(), parts[1].strip()
+    return Candidate(letter or title_letter(title), title, author)
+
+
+class CandidateStore:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or DEFAULT_CANDIDATES_FILE
+        with open(self.path, encoding='utf-8') as file:
+            data = json.load(file)
+
+        self.sources = {}  # source -> [Candidate] in file order
+        self.categories = {}  # category -> candidates or LazyCategory, in file order
+        self.letters = {}  # (source, letter) -> [Candidate]; source None spans every source
+        self.titles = {}  # title -> [Candidate]
+        self.authors = {}  # author -> [Candidate]
+        self.retired = set()  # candidates whose title or author is taken
+        self.cursors = {}  # (source, letter) -> candidates skipped for good
+
+        self._add('by_letter', [parse_candidate(book, letter)
+                                for letter, books in data.get('by_letter', {}).items()
+                                for book in books])
+        for name, spec in data.get('categories', {}).items():
+            if 'books' in spec:
+                self.categories[name] = self._add(name, [parse_candidate(book) for book in spec['books']])
+            else:
+                self.categories[name] = self._series(spec)
+        self._add('general', [parse_candidate(book) for book in data.get('general', [])])
+        self._add('final', [parse_candidate(book) for book in data.get('final', [])])
+
+        # Fixed line edits, (file, line_number, new_line)
+        self.pinned = [(fix['file'], fix['line'], fix['entry']) for fix in data.get('pinned', [])]
+
+    def _add(self, source: str, candidates: List[Optional[Candidate]]) -> List[Candidate]:
+        candidates = [candidate for candidate in candidates if candidate]
+        self.sources[source] = candidates
+
+        for candidate in candidates:
+            self.letters.setdefault((source, candidate.letter), []).append(candidate)
+            self.letters.setdefault((None, candidate.letter), []).append(candidate)
+            self.titles.setdefault(candidate.title, []).append(candidate)
+            self.authors.setdefault(candidate.author, []).append(candidate)
+
+        return candidates
+
+    @staticmethod
+    def _series(spec: Dict) -> LazyCategory:
+        """Templated category, expanded only when iterated and never indexed.
+
+        Its size counts only the entries that parse, like the candidates it yields.
+        """
+        if 'numbered' in spec:
+            first, last = spec['numbered']
+            subjects = range(first, last + 1)
+        else:
+            subjects = spec['subjects']
+        books = LazyCategory.series(subjects, spec['templates'])
+
+        def parsed(template: str) -> int:
+            # A " - " in the template's own text survives every subject
+            if any(" - " in text for text in template.split('{}')):
+                return len(subjects)
+            return sum(1 for subject in subjects if parse_candidate(template.format(subject)))
+
+        def generate():
+            for book in books:
+                candidate = parse_candidate(book)
+                if candidate:
+                    yield candidate
+
+        return LazyCategory(generate, sum(map(parsed, spec['templates'])))
+
+    def source(self, name: str) -> List[Candidate]:
+        return self.sources.get(name, [])
+
+    def exclude(self, taken_titles: Container[str], taken_authors: Container[str]) -> None:
+        """Retire every indexed candidate whose title or author is already taken.
+
+        One membership check per distinct candidate name, so index-backed
+        taken views answer with a point query each.
+        """
+        for names, taken in ((self.titles, taken_titles), (self.authors, taken_authors)):
+            for name, candidates in names.items():
+                if name in taken:
+                    self.retired.update(candidates)
+
+    def take(self, title: str, author: str) -> None:
+        """Retire the candidates that share a newly used title or author."""
+        self.retired.update(self.titles.get(title, ()))
+        self.retired.update(self.authors.get(author, ()))
+
+    def unused(self, letter: str, source: Optional[str] = None) -> Iterator[Candidate]:
+        """Candidates for letter that are not retired.
+
+        Nothing is retired here; callers exclude the catalog's names once and
+        take what they use. Retirement is permanent, so a retired candidate
+        at the front is skipped for good and later calls start past it.
+        """
+        key = (source, letter)
+        candidates = self.letters.get(key, ())
+        start = self.cursors.get(key, 0)
+
+        while start < len(candidates) and candidates[start] in self.retired:
+            start += 1
+        self.cursors[key] = start
+
+        for candidate in candidates[start:]:
+            if candidate not in self.retired:
+                yield candidate
+
+def load_candidates(path: Optional[str] = None) -> Optional[CandidateStore]:
+    """Load the candidate store, printing the error and returning None on failure."""
+    try:
+        return CandidateStore(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error loading replacement candidates from {path or DEFAULT_CANDIDATES_FILE}: {e}")
+        return None
+
+
+def add_candidate_arguments(parser) -> None:
+    parser.add_argument('--candidates', default=None, metavar='PATH',
+                        help=f"replacement candidate file (default: {os.path.basename(DEFAULT_CANDIDATES_FILE)} "
+                             f"next to the scripts)")
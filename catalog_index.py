@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Catalog Index
+Persistent SQLite index of titles and authors -> (letter, line, entry_number).
+Titles and authors match exactly, like the in-memory fixers; the normalized
+keys only back the opt-in case/space-insensitive lookups.
+Only files whose mtime/size changed are reparsed; fixers keep it current as they write.
+"""
+
+import argparse
+import os
+import sqlite3
+from typing import Callable, Dict, Iterator, List, Optional
+
+from book_records import FILES, Location
+from catalog_parser import catalog_files, iter_file_records, normalize_key, parse_line
+
+DEFAULT_INDEX_FILE = '.book_index.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    letter TEXT NOT NULL,
+    file_order INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS books (
+    path TEXT NOT NULL,
+    line_no INTEGER NOT NULL,
+    letter TEXT NOT NULL,
+    entry_number INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    author_key TEXT NOT NULL,
+    PRIMARY KEY (path, line_no)
+);
+CREATE INDEX IF NOT EXISTS books_title_key ON books (title_key);
+CREATE INDEX IF NOT EXISTS books_author_key ON books (author_key);
+CREATE INDEX IF NOT EXISTS books_title ON books (title);
+CREATE INDEX IF NOT EXISTS books_author ON books (author);
+"""
+
+
+class TakenNames:
+    """Set-like "is this name taken?" view answered by point queries on the index.
+
+    Names added since loading are held in memory until the edits that use
+    them are flushed into the index. Names match exactly.
+    """
+
+    def __init__(self, lookup: Callable[[str], bool], count: Callable[[], int]):
+        self.lookup = lookup
+        self.count = count
+        self.added = set()  # names taken since loading
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.added or self.lookup(name)
+
+    def add(self, name: str) -> None:
+        if name not in self:
+            self.added.add(name)
+
+    def __len__(self) -> int:
+        return self.count() + len(self.added)
+
+
+class CatalogIndex:
+    def __init__(self, path: str = DEFAULT_INDEX_FILE):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def refresh(self, directory: str = '.') -> int:
+        """Reindex catalog files that changed since the last refresh; returns how many."""
+        known = {path: (mtime_ns, size) for path, mtime_ns, size in
+                 self.connection.execute("SELECT path, mtime_ns, size FROM files")}
+        seen = set()
+        reindexed = 0
+
+        with self.connection:
+            for file_order, (letter, file_path) in enumerate(catalog_files(directory)):
+                filepath = str(file_path)
+                seen.add(filepath)
+                stat = os.stat(filepath)
+
+                if known.get(filepath) == (stat.st_mtime_ns, stat.st_size):
+                    self.connection.execute("UPDATE files SET file_order = ? WHERE path = ?",
+                                            (file_order, filepath))
+                    continue
+
+                self._index_file(filepath, letter, file_order)
+                reindexed += 1
+
+            for filepath in set(known) - seen:
+                self.connection.execute("DELETE FROM books WHERE path = ?", (filepath,))
+                self.connection.execute("DELETE FROM files WHERE path = ?", (filepath,))
+
+        return reindexed
+
+    def _index_file(self, filepath: str, letter: str, file_order: int) -> None:
+        """Replace every row of one file with a fresh parse."""
+        stat = os.stat(filepath)
+        self.connection.execute("DELETE FROM books WHERE path = ?", (filepath,))
+        self.connection.executemany(
+            "INSERT INTO books VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            ((filepath, record.line_no, record.letter, record.entry_number, record.title,
+              record.author, normalize_key(record.title), normalize_key(record.author))
+             for record in iter_file_records(filepath, letter)))
+        self.connection.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                                (filepath, letter, file_order, stat.st_mtime_ns, stat.st_size))
+
+    def apply_line_edits(self, filepath: str, edits: Dict[int, str]) -> None:
+        """Update the rows of lines rewritten in filepath and re-stamp the file."""
+        row = self.connection.execute("SELECT letter FROM files WHERE path = ?", (filepath,)).fetchone()
+        if row is None:
+            return
+
+        letter = row[0]
+        stat = os.stat(filepath)
+
+        with self.connection:
+            for line_no, new_line in edits.items():
+                self.connection.execute("DELETE FROM books WHERE path = ? AND line_no = ?",
+                                        (filepath, line_no))
+                record = parse_line(new_line, letter, line_no)
+                if record:
+                    self.connection.execute(
+                        "INSERT INTO books VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (filepath, line_no, letter, record.entry_number, record.title, record.author,
+                         normalize_key(record.title), normalize_key(record.author)))
+
+            self.connection.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+                                    (stat.st_mtime_ns, stat.st_size, filepath))
+
+    def title_taken(self, title: str) -> bool:
+        """Is this exact title already in the catalog?"""
+        return self.connection.execute("SELECT 1 FROM books WHERE title = ? LIMIT 1",
+                                       (title,)).fetchone() is not None
+
+    def author_taken(self, author: str) -> bool:
+        """Is this exact author already in the catalog?"""
+        return self.connection.execute("SELECT 1 FROM books WHERE author = ? LIMIT 1",
+                                       (author,)).fetchone() is not None
+
+    def title_count(self) -> int:
+        return self.connection.execute("SELECT COUNT(DISTINCT title) FROM books").fetchone()[0]
+
+    def author_count(self) -> int:
+        return self.connection.execute("SELECT COUNT(DISTINCT author) FROM books").fetchone()[0]
+
+    def taken_titles(self) -> TakenNames:
+        """Exact titles in use, for uniqueness checks without loading every title."""
+        return TakenNames(self.title_taken, self.title_count)
+
+    def taken_authors(self) -> TakenNames:
+        return TakenNames(self.author_taken, self.author_count)
+
+    def iter_locations(self, where: str = '', params: tuple = ()) -> Iterator[tuple]:
+        """Yield (title, Location) in catalog order."""
+        query = ("SELECT b.title, b.path, b.line_no, b.letter, b.entry_number, b.author "
+                 "FROM books b JOIN files f ON f.path = b.path "
+                 f"{where} ORDER BY f.file_order, b.line_no")
+
+        for title, path, line_no, letter, entry_number, author in self.connection.execute(query, params):
+            yield title, Location(FILES.id_for(path), line_no, letter, entry_number, author)
+
+    def locations(self, title: str, normalized: bool = False) -> List[Location]:
+        """Every location of a title; normalized=True also matches other case or spacing."""
+        if normalized:
+            where, params = "WHERE b.title_key = ?", (normalize_key(title),)
+        else:
+            where, params = "WHERE b.title = ?", (title,)
+        return [location for _, location in self.iter_locations(where, params)]
+
+    def duplicates(self, normalized: bool = False) -> Dict[str, List[Location]]:
+        """title -> locations for titles that occur more than once.
+
+        Exact titles by default, like the fixers; normalized=True also groups
+        titles that differ only in case or spacing (keyed by first spelling).
+        """
+        column = 'title_key' if normalized else 'title'
+        where = (f"WHERE b.{column} IN (SELECT {column} FROM books "
+                 f"GROUP BY {column} HAVING COUNT(*) > 1)")
+
+        groups = {}
+        first_spelling = {}
+        for title, location in self.iter_locations(where):
+            key = normalize_key(title) if normalized else title
+            first_spelling.setdefault(key, title)
+            groups.setdefault(first_spelling[key], []).append(location)
+
+        return groups
+
+
+def main(argv: Optional[List[str]] = None):
+    """Build or query the catalog index."""
+    parser = argparse.ArgumentParser(description="Build or query the persistent title/author index.")
+    parser.add_argument('--index', default=DEFAULT_INDEX_FILE, metavar='PATH',
+                        help=f"index file (default: {DEFAULT_INDEX_FILE})")
+    parser.add_argument('--title', help="show where a title appears")
+    parser.add_argument('--author', help="check whether an author is already used")
+    parser.add_argument('--duplicates', action='store_true', help="list duplicate titles")
+    parser.add_argument('--normalized', action='store_true',
+                        help="match --title and group --duplicates case/space-insensitively")
+    args = parser.parse_args(argv)
+
+    index = CatalogIndex(args.index)
+    reindexed = index.refresh()
+    print(f"Index {args.index}: {reindexed} file(s) reindexed")
+
+    if args.title:
+        locations = index.locations(args.title, normalized=args.normalized)
+        print(f"'{args.title}' appears {len(locations)} time(s)")
+        for location in locations:
+            print(f"  {location.file}:{location.line_number} "
+                  f"(#{location.entry_number}) by {location.author}")
+
+    if args.author:
+        taken = index.author_taken(args.author)
+        print(f"Author '{args.author}' is {'already used' if taken else 'unused'}")
+
+    if args.duplicates:
+        duplicates = index.duplicates(normalized=args.normalized)
+        print(f"Found {len(duplicates)} duplicate titles")
+        for title, locations in duplicates.items():
+            print(f"  '{title}' appears {len(locations)} times")
+
+    index.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Catalog I/O
+Asyncio layer over the blocking parser and writer. File reads and rewrites run
+in worker threads, so on network filesystems the per-file latency of the 26
+letter files overlaps instead of adding up.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Callable, List, Sequence, Tuple
+
+from catalog_parser import BookRecord, catalog_files, iter_file_records
+
+DEFAULT_IO_THREADS = 8
+
+
+def read_file_records(filepath: str, letter: str) -> List[BookRecord]:
+    """Parse a whole letter file; the blocking half of the async loader."""
+    return list(iter_file_records(filepath, letter))
+
+
+async def run_in_threads(func: Callable, calls: Sequence[Tuple],
+                         threads: int = DEFAULT_IO_THREADS) -> List:
+    """Run func(*args) for every args tuple in worker threads; results in call order."""
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=max(1, threads)) as executor:
+        return await asyncio.gather(*(loop.run_in_executor(executor, func, *args) for args in calls))
+
+
+async def iter_catalog_reads(directory: str = '.', threads: int = DEFAULT_IO_THREADS,
+                             files: Sequence[str] = None) -> AsyncIterator[Tuple[str, str, Awaitable[List[BookRecord]]]]:
+    """Start reading every catalog file at once and yield (letter, filepath, pending records) A-Z.
+
+    Awaiting the pending records returns the file's BookRecords or raises the
+    error hit while reading it, so one bad file does not stop the others.
+    Only files listed in files are read when it is given.
+    """
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=max(1, threads)) as executor:
+        reads = [(letter, str(file_path)) for letter, file_path in catalog_files(directory)]
+        if files is not None:
+            wanted = set(files)
+            reads = [(letter, filepath) for letter, filepath in reads if filepath in wanted]
+
+        pending = [(letter, filepath, loop.run_in_executor(executor, read_file_records, filepath, letter))
+                   for letter, filepath in reads]
+        try:
+            for read in pending:
+                yield read
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+
+
+def add_io_arguments(parser) -> None:
+    """Add the shared --io-threads option to an entry point."""
+    parser.add_argument('--io-threads', type=int, nargs='?', const=DEFAULT_IO_THREADS, default=None,
+                        metavar='N', help=f"read and rewrite letter files concurrently in N threads "
+                                          f"(default N: {DEFAULT_IO_THREADS}); helps on network filesystems")
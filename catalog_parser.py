@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Catalog Parser
+Shared single-pass parser for the markdown book database files (A-Z).
+"""
+
+import json
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from instrumentation import metrics
+
+LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+# Optional list of shard files; without it the catalog is one books_{letter}.md per letter
+MANIFEST_FILE = 'books_manifest.json'
+SHARD_NAME = re.compile(r'^books_([A-Z])\.(\d+)\.md$')
+
+# Pattern: Number. Title - Author
+# The title/author part is optional so that a numbered line which does not
+# parse as an entry is still recognised with a single match per line.
+ENTRY_PATTERN = re.compile(r'^(\d+)\.(?:\s+(.+?)\s+-\s+(.+)$)?')
+
+# The same pattern over raw bytes for the mmap scanner. Every line, entry or not,
+# is consumed by exactly one match, so the line number is the match count. Bytes
+# classes only know ASCII whitespace; files holding UTF-8 encoded Unicode
+# whitespace (UNICODE_SPACE) or bare \r line breaks go through the line reader.
+UNICODE_SPACE = re.compile(
+    rb'\xc2[\x85\xa0]|\xe1\x9a\x80|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80')
+UNICODE_SPACE_LEADS = (b'\xc2', b'\xe1', b'\xe2', b'\xe3')
+SPACE_BYTES = rb'[ \t\f\v\x1c-\x1f]'
+ENTRY_LINE_BYTES = re.compile(
+    rb'(?:' + SPACE_BYTES + rb'*(\d+)\.(?:' + SPACE_BYTES + rb'+([^\n]+?)' + SPACE_BYTES +
+    rb'+-' + SPACE_BYTES + rb'+([^ \t\f\v\x1c-\x1f\n][^\n]*))?)?[^\n]*\n?')
+
+# Files at least this large are scanned through mmap instead of line by line
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+
+class BookRecord(NamedTuple):
+    letter: str
+    line_no: int
+    entry_number: int
+    title: str
+    author: str
+
+
+def letter_from_path(filepath: str) -> Optional[str]:
+    """Extract the letter from a catalog filename (books_A.md or shard books_A.0003.md -> A)."""
+    filename = os.path.basename(filepath)
+
+    if not filename.startswith('books_') or not filename.endswith('.md'):
+        return None
+
+    return filename[len('books_'):-len('.md')].split('.', 1)[0]
+
+
+def read_manifest(directory: str = '.') -> Optional[Dict]:
+    """The catalog manifest, or None when the directory has none (or it is unreadable)."""
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE), 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Error reading {MANIFEST_FILE}: {e}")
+        return None
+
+    if not isinstance(manifest.get('shards'), list):
+        print(f"Error reading {MANIFEST_FILE}: no shard list")
+        return None
+    return manifest
+
+
+def catalog_files(directory: str = '.') -> Iterator[Tuple[str, Path]]:
+    """Yield (letter, path) for every existing catalog file, in catalog order.
+
+    With a manifest its shards are listed in manifest order, except that a
+    letter's shards are always kept together at its first position, so every
+    loader can finish one letter before starting the next. Without one the
+    catalog is books_A.md .. books_Z.md, each followed by any numbered shards
+    of that letter (books_A.0001.md, ...).
+    """
+    current_dir = Path(directory)
+    manifest = read_manifest(directory)
+
+    if manifest is not None:
+        letters = {}  # letter -> [path], letters in order of first appearance
+        for shard in manifest['shards']:
+            letters.setdefault(shard['letter'], []).append(current_dir / shard['file'])
+
+        for letter, paths in letters.items():
+            for file_path in paths:
+                if file_path.exists():
+                    yield letter, file_path
+        return
+
+    for letter in LETTERS:
+        file_path = current_dir / f'books_{letter}.md'
+        if file_path.exists():
+            yield letter, file_path
+
+        for file_path in sorted(current_dir.glob(f'books_{letter}.*.md')):
+            if SHARD_NAME.match(file_path.name):
+                yield letter, file_path
+
+
+def normalize_key(text: str) -> str:
+    """Case- and whitespace-insensitive lookup key."""
+    return ' '.join(text.casefold().split())
+
+
+def parse_line(line: str, letter: str, line_no: int = 0) -> Optional[BookRecord]:
+    """Parse a single markdown line into a BookRecord, or None."""
+    match = ENTRY_PATTERN.match(line.strip())
+
+    if not match or match.group(2) is None:
+        return None
+
+    number, title, author = match.groups()
+    return BookRecord(letter, line_no, int(number), title.strip(), author.strip())
+
+
+def iter_line_records(lines: Iterable[str], letter: str) -> Iterator[BookRecord]:
+    """Stream BookRecords from an iterable of lines (line numbers start at 1)."""
+    match_entry = ENTRY_PATTERN.match
+    line_no = entries = failures = 0
+
+    try:
+        for line_no, line in enumerate(lines, 1):
+            match = match_entry(line.strip())
+
+            if match:
+                if match.group(2) is not None:
+                    entries += 1
+                    number, title, author = match.groups()
+                    yield BookRecord(letter, line_no, int(number), title.strip(), author.strip())
+                else:
+                    # Numbered line that is not "Title - Author"
+                    failures += 1
+    finally:
+        # Counted once per file so the per-line loop stays untouched
+        metrics.count('lines_parsed', line_no)
+        metrics.count('entries_parsed', entries)
+        metrics.count('regex_failures', failures)
+
+
+def iter_file_records(filepath: str, letter: Optional[str] = None) -> Iterator[BookRecord]:
+    """Stream BookRecords from a single catalog file."""
+    if letter is None:
+        letter = letter_from_path(str(filepath)) or ''
+
+    if os.path.getsize(filepath) >= MMAP_THRESHOLD:
+        yield from iter_mmap_records(filepath, letter)
+        return
+
+    with open(filepath, 'r', encoding='utf-8') as file:
+        yield from iter_line_records(file, letter)
+
+
+def has_unicode_space(buffer) -> bool:
+    """Whether a UTF-8 buffer holds any whitespace beyond ASCII."""
+    # Single-byte finds are memchr-fast; the regex only runs from the first lead byte
+    leads = [position for position in map(buffer.find, UNICODE_SPACE_LEADS) if position != -1]
+    return bool(leads) and UNICODE_SPACE.search(buffer, min(leads)) is not None
+
+
+def iter_mmap_records(filepath: str, letter: str) -> Iterator[BookRecord]:
+    """Stream BookRecords by scanning a memory-mapped file.
+
+    The regex runs over the mapped bytes, so lines are never copied into
+    Python strings; only the title and author of each entry are decoded.
+    Produces the same records as iter_line_records for entry numbers written
+    in ASCII digits.
+    """
+    with open(filepath, 'rb') as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        if buffer.find(b'\r') != -1 or has_unicode_space(buffer):
+            with open(filepath, 'r', encoding='utf-8') as text:
+                yield from iter_line_records(text, letter)
+            return
+
+        size = len(buffer)
+        line_no = entries = failures = 0
+
+        try:
+            for line_no, match in enumerate(ENTRY_LINE_BYTES.finditer(buffer), 1):
+                number, title, author = match.groups()
+
+                if number is not None:
+                    if title is not None:
+                        entries += 1
+                        yield BookRecord(letter, line_no, int(number),
+                                         title.decode('utf-8').strip(), author.decode('utf-8').strip())
+                    else:
+                        # Numbered line that is not "Title - Author"
+                        failures += 1
+        finally:
+            # finditer ends with an empty match at the end of the buffer
+            if line_no and match.start() == size:
+                line_no -= 1
+            metrics.count('lines_parsed', line_no)
+            metrics.count('entries_parsed', entries)
+            metrics.count('regex_failures', failures)
+
+
+def iter_catalog_records(directory: str = '.') -> Iterator[Tuple[Path, BookRecord]]:
+    """Stream (path, BookRecord) for every entry in the catalog, A-Z in order."""
+    for letter, file_path in catalog_files(directory):
+        for record in iter_file_records(str(file_path), letter):
+            yield file_path, record
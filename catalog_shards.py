@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Catalog Shards
+Splits letter files that outgrow a size limit into numbered shards
+(books_S.0001.md, books_S.0002.md, ...) and records the layout in
+books_manifest.json, which every loader reads through catalog_files().
+Entry numbers and line order are kept, so shards of a letter read back in
+manifest order give the original lines.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from catalog_parser import MANIFEST_FILE, SHARD_NAME, catalog_files, read_manifest
+
+MANIFEST_VERSION = 1
+DEFAULT_MAX_SHARD_BYTES = 4 * 1024 * 1024
+SIZE_SUFFIXES = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+
+def shard_filename(letter: str, number: int) -> str:
+    return f'books_{letter}.{number:04d}.md'
+
+
+def parse_size(text: str) -> int:
+    """Byte count from '4M', '512K' or a plain number."""
+    text = text.strip().upper().rstrip('B')
+    if text and text[-1] in SIZE_SUFFIXES:
+        return int(float(text[:-1]) * SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+def write_manifest(directory: str, shards: List[Tuple[str, str]], max_shard_bytes: int) -> None:
+    """Write the manifest atomically; shards are (letter, filename) in catalog order."""
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'max_shard_bytes': max_shard_bytes,
+        'shards': [{'letter': letter, 'file': filename} for letter, filename in shards],
+    }
+
+    path = os.path.join(directory, MANIFEST_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2)
+        file.write('\n')
+    os.replace(path + '.tmp', path)
+
+
+def next_shard_number(directory: str, letter: str) -> int:
+    """First shard number no existing file of letter uses."""
+    numbers = [int(SHARD_NAME.match(path.name).group(2))
+               for path in Path(directory).glob(f'books_{letter}.*.md') if SHARD_NAME.match(path.name)]
+    return max(numbers, default=0) + 1
+
+
+def split_letter(directory: str, letter: str, paths: List[Path], max_bytes: int) -> List[str]:
+    """Rewrite one letter's files as shards of at most max_bytes; returns the new filenames.
+
+    Lines are never split, so a single line longer than max_bytes gets a shard of its own.
+    Shards get numbers no existing file uses, so nothing the manifest lists is touched.
+    """
+    temp_paths = []
+    target = None
+    size = 0
+
+    try:
+        for path in paths:
+            with open(path, 'rb') as source:
+                for line in source:
+                    if not line.endswith(b'\n'):
+                        line += b'\n'  # keep the next file's first line separate
+                    if target is None or (size and size + len(line) > max_bytes):
+                        if target is not None:
+                            target.close()
+                        fd, temp_path = tempfile.mkstemp(prefix='.tmp_', suffix='.md', dir=directory)
+                        temp_paths.append(temp_path)
+                        # mkstemp creates 0600 files; shards get the letter file's permissions
+                        shutil.copymode(paths[0], temp_path)
+                        target = os.fdopen(fd, 'wb')
+                        size = 0
+                    target.write(line)
+                    size += len(line)
+        if target is not None:
+            target.close()
+    except BaseException:
+        if target is not None:
+            target.close()
+        for temp_path in temp_paths:
+            os.remove(temp_path)
+        raise
+
+    filenames = []
+    for number, temp_path in enumerate(temp_paths, next_shard_number(directory, letter)):
+        filename = shard_filename(letter, number)
+        os.replace(temp_path, os.path.join(directory, filename))
+        filenames.append(filename)
+
+    return filenames
+
+
+def split_catalog(directory: str = '.', max_bytes: Optional[int] = None) -> Dict[str, int]:
+    """Shard every letter with a file over max_bytes and write the manifest.
+
+    max_bytes defaults to the limit stored in the manifest, then to
+    DEFAULT_MAX_SHARD_BYTES. Returns {letter: shard count} for the letters
+    that were re-sharded.
+    """
+    manifest = read_manifest(directory) or {}
+    if max_bytes is None:
+        max_bytes = manifest.get('max_shard_bytes', DEFAULT_MAX_SHARD_BYTES)
+
+    letters = OrderedDict()  # letter -> [paths] in catalog order
+    for letter, file_path in catalog_files(directory):
+        letters.setdefault(letter, []).append(file_path)
+
+    oversized = [letter for letter, paths in letters.items()
+                 if any(os.path.getsize(path) > max_bytes for path in paths)]
+    if oversized and not manifest:
+        # Without a manifest loaders glob for shards; pin the current files
+        # first so new shards stay invisible until the new manifest lists them
+        write_manifest(directory, [(letter, path.name) for letter, paths in letters.items()
+                                   for path in paths], max_bytes)
+
+    shards = []
+    resharded = {}
+    stale = []
+
+    try:
+        for letter, paths in letters.items():
+            if letter not in oversized:
+                shards.extend((letter, path.name) for path in paths)
+                continue
+
+            filenames = split_letter(directory, letter, paths, max_bytes)
+            shards.extend((letter, filename) for filename in filenames)
+            stale.extend(paths)
+            resharded[letter] = len(filenames)
+    except BaseException:
+        # Unlisted shards of letters already split
+        for letter, filename in shards:
+            if letter in resharded:
+                os.remove(os.path.join(directory, filename))
+        raise
+
+    # Swapping the manifest publishes every new shard at once; the old files
+    # are unlisted from then on and only removed afterwards
+    write_manifest(directory, shards, max_bytes)
+    for path in stale:
+        os.remove(path)
+
+    return resharded
+
+
+def main(argv: Optional[List[str]] = None):
+    """Split oversized letter files into shards and write the manifest."""
+    parser = argparse.ArgumentParser(description="Split large letter files into shards listed in a manifest.")
+    parser.add_argument('--max-size', type=parse_size, default=None, metavar='BYTES',
+                        help=f"largest shard, e.g. 512K or 4M (default: the manifest's limit, "
+                             f"else {DEFAULT_MAX_SHARD_BYTES // (1024 * 1024)}M)")
+    parser.add_argument('--directory', default='.', help="catalog directory (default: .)")
+    args = parser.parse_args(argv)
+
+    print("Catalog Shard Splitter")
+    print("=" * 40)
+
+    try:
+        resharded = split_catalog(args.directory, args.max_size)
+    except OSError as e:
+        print(f"Error splitting catalog: {e}")
+        return
+
+    for letter, count in resharded.items():
+        print(f"  {letter}: split into {count} shards")
+    if not resharded:
+        print("  No letter file exceeds the size limit")
+
+    shard_count = len(read_manifest(args.directory)['shards'])
+    print(f"\nManifest written to {MANIFEST_FILE} ({shard_count} files)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Catalog Stats
+Online aggregator for the analysis report and duplicate summary. Rows are
+folded in once as they are loaded, so reporting needs no further passes over
+the catalog.
+"""
+
+from collections import Counter
+from typing import Iterable, Optional
+
+from book_records import BookRow
+from sketches import SketchCounter
+
+GENRE_SEPARATOR = ' | '
+
+
+class CatalogStats:
+    def __init__(self, sketch: bool = False):
+        # Sketch mode keeps titles and authors in fixed-size approximate counters
+        self.sketch = sketch
+        self.reset()
+
+    def reset(self) -> None:
+        self.books = 0
+        self.title_length_total = 0
+        self.longest = None  # first book with the maximum title length
+        self.shortest = None  # first book with the minimum title length
+        self.letter_counts = Counter()
+        self.genre_counts = Counter()
+        self.title_counts = SketchCounter() if self.sketch else Counter()
+        self.author_counts = SketchCounter() if self.sketch else Counter()
+
+    def add(self, book: BookRow) -> None:
+        """Fold one row into every statistic."""
+        self.books += 1
+        length = book.title_length
+        self.title_length_total += length
+
+        # Strict comparisons keep the first book on ties, like idxmax/idxmin
+        if self.longest is None or length > self.longest.title_length:
+            self.longest = book
+        if self.shortest is None or length < self.shortest.title_length:
+            self.shortest = book
+
+        self.letter_counts[book.letter] += 1
+        if self.sketch:
+            self.title_counts.add(book.title)
+            self.author_counts.add(book.author)
+        else:
+            self.title_counts[book.title] += 1
+            self.author_counts[book.author] += 1
+        for genre in book.genre_hints.split(GENRE_SEPARATOR):
+            self.genre_counts[genre.strip()] += 1
+
+    def add_books(self, books: Iterable[BookRow]) -> None:
+        for book in books:
+            self.add(book)
+
+    @property
+    def mean_title_length(self) -> Optional[float]:
+        return self.title_length_total / self.books if self.books else None
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Catalog Watch
+Polls the catalog files for changes so a long-running converter can reparse
+only the letter files or shards that were edited. Polling needs no extra
+dependencies and works on network filesystems, where inotify events are not
+delivered.
+"""
+
+import os
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+from catalog_parser import catalog_files
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+def file_stamps(directory: str = '.') -> Dict[str, Tuple[str, int, int]]:
+    """{path: (letter, mtime_ns, size)} for every existing catalog file."""
+    stamps = {}
+
+    for letter, file_path in catalog_files(directory):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            continue  # removed between listing and stat
+        stamps[str(file_path)] = (letter, stat.st_mtime_ns, stat.st_size)
+
+    return stamps
+
+
+class CatalogWatcher:
+    def __init__(self, directory: str = '.', interval: float = DEFAULT_POLL_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        # Taken up front so edits made while the first load runs are still seen
+        self.stamps = file_stamps(directory)
+
+    def poll(self) -> Dict[str, Optional[str]]:
+        """Files changed since the last poll: {path: letter, or None if the file is gone}."""
+        current = file_stamps(self.directory)
+        changed = {filepath: stamp[0] for filepath, stamp in current.items()
+                   if self.stamps.get(filepath) != stamp}
+        changed.update((filepath, None) for filepath in self.stamps if filepath not in current)
+        self.stamps = current
+        return changed
+
+    def changes(self) -> Iterator[Dict[str, Optional[str]]]:
+        """Block and yield each batch of changed files, forever.
+
+        A batch is only reported once the files have stopped changing for one
+        interval, so an editor writing a file in several steps triggers a
+        single rebuild.
+        """
+        while True:
+            time.sleep(self.interval)
+            changed = self.poll()
+            if not changed:
+                continue
+
+            while True:
+                time.sleep(self.interval)
+                more = self.poll()
+                if not more:
+                    break
+                changed.update(more)
+
+            yield changed
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Catalog Writer
+Batches line replacements per markdown file and flushes each file exactly once,
+streaming it through a temp file so large letter files are never held in memory.
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Optional, Set, Tuple
+
+from book_records import Location
+from catalog_io import DEFAULT_IO_THREADS, run_in_threads
+from instrumentation import metrics
+
+
+def rewrite_lines(filepath: str, edits: Dict[int, str]) -> Tuple[int, int]:
+    """Stream filepath through a temp file with {line_number: new_line} edits applied.
+
+    Only one line is held in memory at a time, and the temp file is renamed
+    into place only if an edit applied. Returns (edits applied, line count).
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, temp_path = tempfile.mkstemp(prefix='.tmp_', suffix='.md', dir=directory)
+    applied = line_count = 0
+
+    try:
+        with open(filepath, 'r', encoding='utf-8') as source, \
+                os.fdopen(fd, 'w', encoding='utf-8') as target:
+            for line_count, line in enumerate(source, 1):
+                new_line = edits.get(line_count)
+                if new_line is not None:
+                    line = new_line + '\n'
+                    applied += 1
+                target.write(line)
+
+        if not applied:
+            os.remove(temp_path)
+            return applied, line_count
+
+        shutil.copymode(filepath, temp_path)
+        size = os.path.getsize(temp_path)
+        os.replace(temp_path, filepath)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    metrics.count('files_rewritten')
+    metrics.count('bytes_written', size)
+    return applied, line_count
+
+
+class LineEditBatch:
+    def __init__(self, index=None, io_threads: Optional[int] = None):
+        self.pending = {}  # filepath -> {line_number: new_line}
+        self.index = index  # optional CatalogIndex kept in sync on flush
+        self.io_threads = io_threads  # rewrite files concurrently when > 1
+
+    def stage(self, filepath: str, line_number: int, new_line: str) -> None:
+        """Queue a replacement for a specific line; later edits to the same line win."""
+        self.pending.setdefault(filepath, {})[line_number] = new_line
+
+    def flush(self) -> Dict[str, Set[int]]:
+        """Rewrite every touched file once. Returns {filepath: line numbers replaced}."""
+        if self.io_threads and self.io_threads > 1:
+            return asyncio.run(self.flush_async())
+
+        with metrics.phase('write'):
+            written = {}
+            for filepath, edits in self.pending.items():
+                self._record(written, filepath, edits, self._rewrite(filepath, edits))
+        self.pending = {}
+        return written
+
+    async def flush_async(self) -> Dict[str, Set[int]]:
+        """Like flush, with the file rewrites running concurrently in worker threads."""
+        with metrics.phase('write'):
+            pending = list(self.pending.items())
+            results = await run_in_threads(self._rewrite, pending, self.io_threads or DEFAULT_IO_THREADS)
+
+            # The index is only touched from this thread
+            written = {}
+            for (filepath, edits), result in zip(pending, results):
+                self._record(written, filepath, edits, result)
+        self.pending = {}
+        return written
+
+    def _rewrite(self, filepath: str, edits: Dict[int, str]) -> Optional[Tuple[int, int]]:
+        try:
+            return rewrite_lines(filepath, edits)
+        except Exception as e:
+            print(f"Error updating {filepath}: {e}")
+            return None
+
+    def _record(self, written: Dict[str, Set[int]], filepath: str, edits: Dict[int, str],
+                result: Optional[Tuple[int, int]]) -> None:
+        if result is None:
+            return
+
+        applied, line_count = result
+        if applied < len(edits):
+            print(f"Error updating {filepath}: {len(edits) - applied} line(s) out of range")
+
+        if applied:
+            # rewrite_lines applies exactly the edits that fall inside the file
+            applied_edits = {line_number: new_line for line_number, new_line in edits.items()
+                             if 1 <= line_number <= line_count}
+            written[filepath] = set(applied_edits)
+
+            if self.index is not None:
+                try:
+                    self.index.apply_line_edits(filepath, applied_edits)
+                except Exception as e:
+                    print(f"Error updating {filepath}: {e}")
+
+
+def apply_replacements_to_index(all_books: Dict[str, List[Location]],
+                                replacements: List[Tuple[str, Location, str, str]]) -> None:
+    """Move replaced locations from their old title to their new title in a title -> [locations] index."""
+    for old_title, location, new_title, new_author in replacements:
+        locations = all_books.get(old_title, [])
+        if location in locations:
+            locations.remove(location)
+        if not locations:
+            all_books.pop(old_title, None)
+
+        all_books.setdefault(new_title, []).append(location.with_author(new_author))
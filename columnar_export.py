@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Columnar Export
+Writes the book table as Parquet or Arrow IPC with typed, dictionary-encoded columns.
+Requires pyarrow (pip install pyarrow); the rest of the project does not.
+"""
+
+from typing import List
+
+from book_records import BookRow
+
+COLUMNAR_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+# Low-cardinality columns stored as dictionaries
+DICTIONARY_COLUMNS = ['letter', 'author', 'genre_hints']
+
+
+def build_table(books: List[BookRow]):
+    """Build a pyarrow Table in CSV column order with typed columns."""
+    import pyarrow as pa
+
+    def column(name):
+        return [getattr(book, name) for book in books]
+
+    def dictionary(name):
+        return pa.array(column(name), type=pa.string()).dictionary_encode()
+
+    return pa.table({
+        'title': pa.array(column('title'), type=pa.string()),
+        'author': dictionary('author'),
+        'letter': dictionary('letter'),
+        'entry_number': pa.array(column('entry_number'), type=pa.int32()),
+        'title_length': pa.array(column('title_length'), type=pa.int32()),
+        'author_last_name': pa.array(column('author_last_name'), type=pa.string()),
+        'genre_hints': dictionary('genre_hints'),
+    })
+
+
+def write_columnar(books: List[BookRow], output_file: str, fmt: str = 'parquet') -> None:
+    """Write books (already in export order) as Parquet or Arrow IPC."""
+    table = build_table(books)
+
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(table, output_file, use_dictionary=DICTIONARY_COLUMNS)
+    elif fmt == 'arrow':
+        import pyarrow.feather as feather
+        # Uncompressed IPC files can be memory-mapped by readers
+        feather.write_feather(table, output_file, compression='uncompressed')
+    else:
+        raise ValueError(f"Unknown columnar format: {fmt}")
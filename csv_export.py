@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+CSV Export
+Pandas-free CSV writing helpers, including a bounded-memory external merge sort.
+"""
+
+import csv
+import heapq
+import os
+import tempfile
+from typing import Callable, Iterable, Iterator, List, Sequence
+
+from instrumentation import metrics
+
+CSV_COLUMNS = ['title', 'author', 'letter', 'entry_number',
+               'title_length', 'author_last_name', 'genre_hints']
+
+# Column positions used by the author-sorted export
+AUTHOR_SORT_COLUMNS = [CSV_COLUMNS.index(name) for name in ('author_last_name', 'author', 'title')]
+
+
+def author_sort_key(row: Sequence) -> tuple:
+    """Sort key matching sort_values(['author_last_name', 'author', 'title'])."""
+    return tuple(row[index] for index in AUTHOR_SORT_COLUMNS)
+
+
+def open_csv_writer(file):
+    """csv.writer producing the same dialect as DataFrame.to_csv."""
+    return csv.writer(file, lineterminator='\n')
+
+
+class ExternalSorter:
+    """Stable external merge sort of CSV rows using sorted runs on disk."""
+
+    def __init__(self, key: Callable[[Sequence], tuple], run_size: int = 100000):
+        self.key = key
+        self.run_size = run_size
+        self.buffer = []
+        self.run_paths = []
+        self.temp_dir = tempfile.TemporaryDirectory(prefix='book_sort_')
+
+    def add(self, row: Sequence) -> None:
+        self.buffer.append(row)
+        if len(self.buffer) >= self.run_size:
+            self._spill()
+
+    def _spill(self) -> None:
+        """Write the buffered rows to disk as one sorted run."""
+        self.buffer.sort(key=self.key)
+        run_path = os.path.join(self.temp_dir.name, f'run_{len(self.run_paths):05d}.csv')
+
+        with open(run_path, 'w', encoding='utf-8', newline='') as file:
+            open_csv_writer(file).writerows(self.buffer)
+
+        self.run_paths.append(run_path)
+        self.buffer = []
+
+    def _read_run(self, run_path: str) -> Iterator[List[str]]:
+        with open(run_path, 'r', encoding='utf-8', newline='') as file:
+            yield from csv.reader(file)
+
+    def sorted_rows(self) -> Iterator[Sequence]:
+        """Yield every added row in key order; equal keys keep insertion order."""
+        self.buffer.sort(key=self.key)
+        runs = [self._read_run(run_path) for run_path in self.run_paths]
+        # The in-memory tail holds the newest rows, so it goes last to stay stable
+        runs.append(iter(self.buffer))
+        yield from heapq.merge(*runs, key=self.key)
+
+    def close(self) -> None:
+        self.temp_dir.cleanup()
+
+
+def write_csv(output_file: str, rows: Iterable[Sequence]) -> int:
+    """Write the header and rows to output_file; returns the number of rows."""
+    count = 0
+
+    with open(output_file, 'w', encoding='utf-8', newline='') as file:
+        writer = open_csv_writer(file)
+        writer.writerow(CSV_COLUMNS)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+
+    metrics.count_export(output_file)
+    return count
@@ -4,141 +4,80 @@ Final Duplicate Fix
 Manually fixes the remaining 25 duplicates with carefully selected unique books.
 """
 
-import os
-import re
-from pathlib import Path
-from collections import defaultdict
+import argparse
 
-def load_all_book_titles():
+from candidate_store import add_candidate_arguments, load_candidates
+from catalog_index import DEFAULT_INDEX_FILE, CatalogIndex
+from book_records import FILES, Location
+from catalog_parser import catalog_files, iter_file_records
+from catalog_writer import LineEditBatch
+from profiling import add_profile_arguments, run_profiled
+
+def load_all_book_titles(index=None):
     """Load all current book titles to avoid new duplicates."""
+    if index is not None:
+        return index.taken_titles()
+
     titles = set()
-    current_dir = Path('.')
-
-    for letter in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
-        file_path = current_dir / f'books_{letter}.md'
-        if file_path.exists():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    for line in file:
-                        line = line.strip()
-                        if re.match(r'^\d+\.', line):
-                            match = re.match(r'^(\d+)\.\s+(.+?)\s+-\s+(.+)$', line)
-                            if match:
-                                _, title, _ = match.groups()
-                                titles.add(title.strip())
-            except Exception as e:
-                print(f"Error reading {file_path}: {e}")
+
+    for letter, file_path in catalog_files():
+        try:
+            for record in iter_file_records(str(file_path), letter):
+                titles.add(record.title)
+        except Exception as e:
+            print(f"Error reading {file_path}: {e}")
 
     return titles
 
-def find_duplicates():
+def find_duplicates(index=None):
     """Find remaining duplicates."""
-    all_books = {}
-    current_dir = Path('.')
-
-    for letter in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
-        file_path = current_dir / f'books_{letter}.md'
-        if file_path.exists():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    lines = file.readlines()
-                    for line_num, line in enumerate(lines, 1):
-                        line = line.strip()
-                        if re.match(r'^\d+\.', line):
-                            match = re.match(r'^(\d+)\.\s+(.+?)\s+-\s+(.+)$', line)
-                            if match:
-                                number, title, author = match.groups()
-                                title = title.strip()
-
-                                if title not in all_books:
-                                    all_books[title] = []
-
-                                all_books[title].append({
-                                    'file': str(file_path),
-                                    'line_number': line_num,
-                                    'letter': letter,
-                                    'entry_number': int(number),
-                                    'author': author.strip(),
-                                    'original_line': line
-                                })
-            except Exception as e:
-                print(f"Error reading {file_path}: {e}")
+    if index is not None:
+        return index.duplicates()
 
-    return {title: locs for title, locs in all_books.items() if len(locs) > 1}
+    all_books = {}
 
-def update_file_line(filepath, line_number, new_line):
-    """Update a specific line in a file."""
-    try:
-        with open(filepath, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
+    for letter, file_path in catalog_files():
+        file_id = FILES.id_for(file_path)
 
-        if 1 <= line_number <= len(lines):
-            lines[line_number - 1] = new_line + '\n'
+        try:
+            for record in iter_file_records(str(file_path), letter):
+                if record.title not in all_books:
+                    all_books[record.title] = []
 
-            with open(filepath, 'w', encoding='utf-8') as file:
-                file.writelines(lines)
+                all_books[record.title].append(
+                    Location(file_id, record.line_no, letter, record.entry_number, record.author))
+        except Exception as e:
+            print(f"Error reading {file_path}: {e}")
 
-    except Exception as e:
-        print(f"Error updating {filepath}: {e}")
+    return {title: locs for title, locs in all_books.items() if len(locs) > 1}
 
-def main():
+def run(args):
+    """Fix the remaining duplicates with parsed command-line arguments."""
     print("Final Duplicate Fix")
     print("=" * 20)
 
+    candidates = load_candidates(args.candidates)
+    if candidates is None:
+        return
+
+    index = None
+    if args.index:
+        index = CatalogIndex(args.index)
+        index.refresh()
+
     # Get existing titles to avoid creating new duplicates
-    existing_titles = load_all_book_titles()
+    existing_titles = load_all_book_titles(index)
     print(f"Found {len(existing_titles)} existing titles")
 
     # Find current duplicates
-    duplicates = find_duplicates()
+    duplicates = find_duplicates(index)
     print(f"Found {len(duplicates)} duplicate titles to fix")
 
-    # Manual replacements for the remaining 25 duplicates
-    # These are guaranteed unique titles not in the current database
-    unique_replacements = [
-        "The Invisible Bridge - Julie Orringer",
-        "The Miniaturist - Jessie Burton",
-        "The Essex Serpent - Sarah Perry",
-        "The Overstory - Richard Powers",
-        "Hamnet - Maggie O'Farrell",
-        "The Song of Solomon - Toni Morrison",
-        "Educated - Tara Westover",
-        "Becoming - Michelle Obama",
-        "Sapiens - Yuval Noah Harari",
-        "The Subtle Art of Not Giving a F*ck - Mark Manson",
-        "Atomic Habits - James Clear",
-        "The 7 Habits of Highly Effective People - Stephen Covey",
-        "Think and Grow Rich - Napoleon Hill",
-        "The Power of Now - Eckhart Tolle",
-        "Man's Search for Meaning - Viktor E. Frankl",
-        "The Alchemist - Paulo Coelho",
-        "Outliers - Malcolm Gladwell",
-        "Freakonomics - Steven Levitt",
-        "The Black Swan - Nassim Nicholas Taleb",
-        "Predictably Irrational - Dan Ariely",
-        "The Tipping Point - Malcolm Gladwell",
-        "Blink - Malcolm Gladwell",
-        "David and Goliath - Malcolm Gladwell",
-        "The Lean Startup - Eric Ries",
-        "Zero to One - Peter Thiel",
-        "Good to Great - Jim Collins",
-        "Built to Last - Jim Collins",
-        "The Innovator's Dilemma - Clayton Christensen",
-        "Blue Ocean Strategy - W. Chan Kim",
-        "The Art of War - Sun Tzu",
-        "The Prince - Niccolò Machiavelli",
-        "The Communist Manifesto - Karl Marx",
-        "On Liberty - John Stuart Mill",
-        "The Republic - Plato",
-        "Meditations - Marcus Aurelius",
-        "The Nicomachean Ethics - Aristotle",
-        "Beyond Good and Evil - Friedrich Nietzsche",
-        "Being and Time - Martin Heidegger",
-        "A Theory of Justice - John Rawls",
-        "The Structure of Scientific Revolutions - Thomas Kuhn"
-    ]
+    # Hand-picked replacements for the remaining duplicates, from the shared store
+    unique_replacements = candidates.source('final')
 
     replacement_index = 0
+    edits = LineEditBatch(index)
 
     for title, locations in duplicates.items():
         # Keep first occurrence, replace others
@@ -147,14 +86,14 @@ def main():
         for location in locations_to_replace:
             if replacement_index < len(unique_replacements):
                 replacement = unique_replacements[replacement_index]
-                new_title = replacement.split(" - ")[0].strip()
+                new_title = replacement.title
 
                 # Double check it's not already in use
                 if new_title not in existing_titles:
-                    new_line = f"{location['entry_number']}. {replacement}"
-                    update_file_line(location['file'], location['line_number'], new_line)
+                    new_line = f"{location.entry_number}. {replacement.line}"
+                    edits.stage(location.file, location.line_number, new_line)
 
-                    print(f"Fixed in {location['letter']}: '{title}' -> '{new_title}'")
+                    print(f"Fixed in {location.letter}: '{title}' -> '{new_title}'")
                     existing_titles.add(new_title)  # Track it
                     replacement_index += 1
                 else:
@@ -163,9 +102,12 @@ def main():
             else:
                 print(f"Ran out of replacements for {title}")
 
+    # Write every touched file once
+    edits.flush()
+
     # Verify
     print("\nVerifying results...")
-    final_duplicates = find_duplicates()
+    final_duplicates = find_duplicates(index)
 
     if final_duplicates:
         print(f"WARNING: {len(final_duplicates)} duplicates still remain:")
@@ -174,5 +116,15 @@ def main():
     else:
         print("SUCCESS: No duplicates found! All books are now unique.")
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replace the remaining duplicates with hand-picked unique books.")
+    parser.add_argument('--index', nargs='?', const=DEFAULT_INDEX_FILE, default=None, metavar='PATH',
+                        help=f"answer title/duplicate queries from a persistent index (default path: {DEFAULT_INDEX_FILE})")
+    add_candidate_arguments(parser)
+    add_profile_arguments(parser, 'final_duplicate_fix')
+    args = parser.parse_args(argv)
+
+    run_profiled(args.profile, run, args)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Genre Classifier
+Keyword and author rules compiled into one regex per column and applied in a single batched pass.
+"""
+
+import re
+from typing import Iterable, List, Sequence, Set, Tuple
+
+DEFAULT_GENRE = 'General Fiction'
+
+# (column, genre, keywords) - order decides the order of the genre hints
+GENRE_RULES = [
+    # Genre indicators in titles
+    ('title', 'Mystery/Crime', ['mystery', 'murder', 'detective', 'crime']),
+    ('title', 'Romance', ['love', 'heart', 'romance']),
+    ('title', 'War/Military', ['war', 'battle', 'soldier', 'army']),
+    ('title', 'Biography/History', ['history', 'biography', 'life of', 'memoir']),
+    ('title', 'Science Fiction', ['science', 'space', 'future', 'robot']),
+    ('title', 'Fantasy', ['magic', 'dragon', 'wizard', 'fantasy']),
+    ('title', 'Children', ['children', 'kid', 'little']),
+
+    # Well-known genre authors
+    ('author', 'Mystery/Crime', ['christie', 'doyle', 'chandler']),
+    ('author', 'Science Fiction', ['asimov', 'bradbury', 'clarke']),
+    ('author', 'Fantasy', ['tolkien', 'lewis', 'gaiman']),
+    ('author', 'Children', ['seuss', 'dahl', 'potter']),
+]
+
+
+class KeywordScanner:
+    """Finds which rules have a keyword occurring anywhere in a text (substring semantics)."""
+
+    def __init__(self, rules: Iterable[Tuple[int, Sequence[str]]]):
+        keyword_rules = {}  # keyword -> rule ids
+        for rule_id, keywords in rules:
+            for keyword in keywords:
+                keyword_rules.setdefault(keyword, set()).add(rule_id)
+
+        # At any position the alternation reports only the longest keyword, so
+        # each keyword also carries the rules of every keyword that prefixes it.
+        self.rules_for = {}
+        for keyword in keyword_rules:
+            rule_ids = set()
+            for other, other_ids in keyword_rules.items():
+                if keyword.startswith(other):
+                    rule_ids |= other_ids
+            self.rules_for[keyword] = frozenset(rule_ids)
+
+        if keyword_rules:
+            alternation = '|'.join(re.escape(keyword) for keyword in
+                                   sorted(keyword_rules, key=len, reverse=True))
+            # Zero-width lookahead so overlapping keywords are all seen
+            self.pattern = re.compile(f'(?=({alternation}))')
+        else:
+            self.pattern = None
+
+    def scan(self, texts: Sequence[str]) -> List[Set[int]]:
+        """Return the set of matched rule ids for every text, in one regex pass."""
+        hits = [set() for _ in texts]
+        if not texts or self.pattern is None:
+            return hits
+
+        # Keywords never contain a newline, so rows cannot match across the separator
+        column = '\n'.join(texts).lower()
+        rules_for = self.rules_for
+
+        row = 0
+        row_end = column.find('\n')
+        for match in self.pattern.finditer(column):
+            position = match.start()
+            while row_end != -1 and position > row_end:
+                row += 1
+                row_end = column.find('\n', row_end + 1)
+            hits[row] |= rules_for[match.group(1)]
+
+        return hits
+
+
+class GenreClassifier:
+    def __init__(self, rules: Sequence[Tuple[str, str, Sequence[str]]] = GENRE_RULES):
+        self.genres = [genre for _, genre, _ in rules]
+        self.title_scanner = KeywordScanner(
+            (rule_id, keywords) for rule_id, (column, _, keywords) in enumerate(rules) if column == 'title')
+        self.author_scanner = KeywordScanner(
+            (rule_id, keywords) for rule_id, (column, _, keywords) in enumerate(rules) if column == 'author')
+
+    def hints(self, title: str, author: str) -> List[str]:
+        """Genre hints for a single book."""
+        return self._genres_for(self.title_scanner.scan([title])[0] |
+                                self.author_scanner.scan([author])[0])
+
+    def classify_many(self, titles: Sequence[str], authors: Sequence[str]) -> List[str]:
+        """Joined genre hint strings for whole title/author columns."""
+        title_hits = self.title_scanner.scan(titles)
+        author_hits = self.author_scanner.scan(authors)
+
+        return [' | '.join(self._genres_for(title_rules | author_rules))
+                for title_rules, author_rules in zip(title_hits, author_hits)]
+
+    def _genres_for(self, rule_ids: Set[int]) -> List[str]:
+        if not rule_ids:
+            return [DEFAULT_GENRE]
+        return [self.genres[rule_id] for rule_id in sorted(rule_ids)]
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Instrumentation
+Lightweight per-phase timings and counters (lines parsed, regex failures, files
+rewritten, bytes written) shared by the converter and the fixers. Collection is
+always on and costs a few additions per file; --metrics only decides the output.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+METRIC_FORMATS = ['json', 'prometheus']
+PROMETHEUS_PREFIX = 'book_catalog'
+
+
+class Metrics:
+    def __init__(self):
+        # Counters are also updated from the async loader's worker threads
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.started = time.perf_counter()
+        self.phases = {}  # phase -> seconds, summed over repeated entries
+        self.counters = Counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block and add it to the named phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self.lock:
+            self.counters[name] += amount
+
+    def count_export(self, path: str) -> None:
+        """Count an exported file and its size."""
+        size = os.path.getsize(path)
+        with self.lock:
+            self.counters['files_exported'] += 1
+            self.counters['bytes_written'] += size
+
+    def merge(self, counters: Dict[str, int]) -> None:
+        """Add counters collected elsewhere, e.g. in a worker process."""
+        with self.lock:
+            self.counters.update(counters)
+
+    def snapshot(self, script: str) -> Dict:
+        return {
+            'script': script,
+            'wall_time': round(time.perf_counter() - self.started, 6),
+            'phases': {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            'counters': dict(sorted(self.counters.items())),
+        }
+
+    def to_json(self, script: str) -> str:
+        return json.dumps(self.snapshot(script), indent=2)
+
+    def to_prometheus(self, script: str) -> str:
+        """Prometheus textfile-collector format."""
+        snapshot = self.snapshot(script)
+        label = f'script="{script}"'
+        lines = [
+            f"# TYPE {PROMETHEUS_PREFIX}_wall_seconds gauge",
+            f"{PROMETHEUS_PREFIX}_wall_seconds{{{label}}} {snapshot['wall_time']}",
+            f"# TYPE {PROMETHEUS_PREFIX}_phase_seconds gauge",
+        ]
+        lines.extend(f'{PROMETHEUS_PREFIX}_phase_seconds{{{label},phase="{name}"}} {seconds}'
+                     for name, seconds in snapshot['phases'].items())
+
+        for name, value in snapshot['counters'].items():
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name}_total counter")
+            lines.append(f"{PROMETHEUS_PREFIX}_{name}_total{{{label}}} {value}")
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str, script: str, fmt: Optional[str] = None) -> None:
+        """Write metrics to path ('-' for stdout); the format defaults from the extension."""
+        if fmt is None:
+            fmt = 'prometheus' if path.endswith('.prom') else 'json'
+        text = self.to_prometheus(script) if fmt == 'prometheus' else self.to_json(script) + '\n'
+
+        if path == '-':
+            sys.stdout.write(text)
+            return
+
+        # Textfile collectors may read at any time, so replace the file atomically
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        os.replace(temp_path, path)
+
+
+# Process-wide collector used by the parser, writers and entry points
+metrics = Metrics()
+
+
+def add_metrics_arguments(parser) -> None:
+    """Add the shared --metrics/--metrics-format options to an entry point."""
+    parser.add_argument('--metrics', metavar='PATH',
+                        help="write phase timings and counters to PATH ('-' for stdout; "
+                             "*.prom is written in Prometheus textfile format)")
+    parser.add_argument('--metrics-format', choices=METRIC_FORMATS, default=None,
+                        help="override the format inferred from the --metrics path")
+
+
+def write_metrics(args, script: str) -> None:
+    """Emit the collected metrics if --metrics was given."""
+    if not args.metrics:
+        return
+
+    try:
+        metrics.write(args.metrics, script, args.metrics_format)
+    except OSError as e:
+        print(f"Error writing metrics to {args.metrics}: {e}")
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detector
+Finds titles that are the same book spelled differently ("Song of Achilles" vs
+"The Song of Achilles", "Quran" vs "Koran"). Candidates come from blocking
+(normalized key, phonetic key and MinHash LSH bands over character 3-grams),
+so only titles sharing a block are ever compared. Titles that normalize to the
+same text form one cluster, and each cluster is compared with at most
+MAX_CANDIDATES others, so the work grows linearly with the catalog.
+"""
+
+import argparse
+import random
+import re
+import unicodedata
+import zlib
+from array import array
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from book_records import Location
+from catalog_parser import iter_catalog_records
+
+LEADING_ARTICLES = ('the ', 'a ', 'an ')
+PUNCTUATION = re.compile(r'[^\w\s]|_')
+DIGITS = re.compile(r'\d+')
+
+DEFAULT_THRESHOLD = 0.88
+PHONETIC_SCORE = 0.9  # same author, different spellings that sound alike
+PHONETIC_MIN_RATIO = 0.6  # ...as long as they are still spelled roughly alike
+MAX_BLOCK_SIZE = 100  # larger blocks are too generic to be useful
+MAX_CANDIDATES = 20  # fuzzy comparisons per cluster, best LSH matches first
+DEFAULT_PERMUTATIONS = 64
+TYPICAL_TITLE_LENGTH = 16  # characters, after normalization
+
+
+class NearDuplicate(NamedTuple):
+    score: float
+    reason: str
+    title_a: str
+    location_a: Location
+    title_b: str
+    location_b: Location
+
+
+def normalize_title(title: str) -> str:
+    """Fold case, diacritics and punctuation, and drop a leading article."""
+    decomposed = unicodedata.normalize('NFKD', title)
+    text = ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+    text = ' '.join(PUNCTUATION.sub(' ', text).split())
+
+    for article in LEADING_ARTICLES:
+        if text.startswith(article) and len(text) > len(article):
+            return text[len(article):]
+    return text
+
+
+def phonetic_key(normalized: str) -> str:
+    """Consonant skeleton so that e.g. "quran" and "koran" both become "krn"."""
+    text = normalized.replace(' ', '').replace('ph', 'f')
+    text = text.translate(str.maketrans('cqz', 'kks'))
+    key = []
+    for char in text:
+        if char in 'aeiouyhw':
+            continue
+        if not key or key[-1] != char:
+            key.append(char)
+    return ''.join(key)
+
+
+def shingles(normalized: str, size: int = 3) -> List[int]:
+    """Hashes of the character n-grams of a normalized title."""
+    padded = f' {normalized} '
+    grams = {padded[i:i + size] for i in range(max(1, len(padded) - size + 1))}
+    return [zlib.crc32(gram.encode('utf-8')) for gram in grams]
+
+
+def jaccard_at_score(score: float, length: int = TYPICAL_TITLE_LENGTH) -> float:
+    """3-gram Jaccard of two titles of about length characters that score this
+    similar because of one inserted run of characters.
+
+    Inserting d characters gives a ratio of 2L / (2L + d); it breaks 2 of the
+    shorter title's L padded 3-grams and adds d + 2 new ones.
+    """
+    inserted = 2 * length * (1 - score) / score
+    return (length - 2) / (length + inserted + 2)
+
+
+class MinHashLSH:
+    """Banded MinHash over shingle hashes; items sharing a band are candidates.
+
+    Shingle hashes are mixed once, then each of the bands * rows "permutations"
+    is an XOR with a random 64-bit mask, so a signature is a handful of
+    builtin min() calls rather than a modular multiply per shingle.
+    """
+
+    MASK = (1 << 64) - 1
+    MIX = 0x9E3779B97F4A7C15
+
+    def __init__(self, bands: int = 12, rows: int = 5, seed: int = 42):
+        rnd = random.Random(seed)
+        self.bands = bands
+        self.rows = rows
+        self.masks = [rnd.getrandbits(64) for _ in range(bands * rows)]
+
+    @classmethod
+    def for_jaccard(cls, jaccard: float, permutations: int = DEFAULT_PERMUTATIONS) -> 'MinHashLSH':
+        """Bands and rows whose collision threshold (1 / bands) ** (1 / rows) is closest to jaccard."""
+        bands, rows = min(((permutations // rows, rows) for rows in range(1, permutations + 1)),
+                          key=lambda shape: abs((1 / shape[0]) ** (1 / shape[1]) - jaccard))
+        return cls(bands, rows)
+
+    @property
+    def threshold(self) -> float:
+        """Jaccard similarity at which a pair shares a band half of the time."""
+        return (1 / self.bands) ** (1 / self.rows)
+
+    def band_keys(self, hashes: Sequence[int]) -> List[Tuple]:
+        mixed = [(value * self.MIX) & self.MASK for value in hashes]
+        signature = [min(map(mask.__xor__, mixed)) for mask in self.masks]
+        rows = self.rows
+        return [(band,) + tuple(signature[band * rows:(band + 1) * rows])
+                for band in range(self.bands)]
+
+
+def similarity(a: str, b: str, same_author: bool = False, cutoff: float = 0.0) -> Tuple[float, str]:
+    """Score two normalized titles; returns (score, reason).
+
+    Sound-alike spellings ("quran"/"koran") only count for the same author,
+    otherwise short titles such as "later"/"letter" collide. Pairs that
+    cannot reach cutoff get a cheap upper bound instead of their exact ratio.
+    """
+    if a == b:
+        return 1.0, 'normalized'
+
+    # Different volume numbers are different books
+    if DIGITS.findall(a) != DIGITS.findall(b):
+        return 0.0, 'numbers'
+
+    # Upper bounds from the lengths, then the character counts, before the full ratio
+    floor = min(cutoff, PHONETIC_MIN_RATIO) if same_author else cutoff
+    bound = 2 * min(len(a), len(b)) / (len(a) + len(b))
+    if bound < floor:
+        return bound, 'similar'
+    matcher = SequenceMatcher(None, a, b)
+    bound = matcher.quick_ratio()
+    if bound < floor:
+        return bound, 'similar'
+
+    score = matcher.ratio()
+    key_a = phonetic_key(a)
+    if (same_author and PHONETIC_MIN_RATIO <= score < PHONETIC_SCORE
+            and len(key_a) >= 3 and key_a == phonetic_key(b)):
+        return PHONETIC_SCORE, 'phonetic'
+    return score, 'similar'
+
+
+def find_near_duplicates(entries: Iterable[Tuple[str, Location]],
+                         threshold: float = DEFAULT_THRESHOLD,
+                         include_exact: bool = False,
+                         lsh: Optional[MinHashLSH] = None) -> List[NearDuplicate]:
+    """Return near-duplicate pairs among (title, location) entries, best first.
+
+    Titles that normalize alike are one cluster: every spelling in it is
+    reported once against the cluster's first entry. Fuzzy matching then runs
+    between clusters, each compared only with the later clusters it shares
+    the most blocks with.
+    """
+    lsh = lsh or MinHashLSH.for_jaccard(jaccard_at_score(threshold))
+    titles = []
+    locations = []
+    clusters = {}  # normalized title -> [entry ids], first entry is the anchor
+
+    for title, location in entries:
+        entry_id = len(titles)
+        titles.append(title)
+        locations.append(location)
+        clusters.setdefault(normalize_title(title), []).append(entry_id)
+
+    pairs = []
+    normalized = list(clusters)
+    anchors = []
+    authors = []  # per cluster, normalized authors
+    band_keys = array('q')  # lsh.bands key hashes per cluster, back to back
+    phonetic_keys = []  # per cluster, key hash or None
+    blocks = {}  # blocking key hash -> cluster id, or [cluster ids] once shared
+
+    for cluster_id, norm in enumerate(normalized):
+        members = clusters[norm]
+        anchor = members[0]
+        anchors.append(anchor)
+        authors.append({normalize_title(locations[entry].author) for entry in members})
+
+        for other in members[1:]:
+            if include_exact or titles[other] != titles[anchor]:
+                pairs.append(NearDuplicate(1.0, 'normalized', titles[anchor], locations[anchor],
+                                           titles[other], locations[other]))
+
+        keys = [hash(('m',) + band) for band in lsh.band_keys(shingles(norm))]
+        band_keys.extend(keys)
+        key = phonetic_key(norm)
+        phonetic_keys.append(hash(('p', key)) if len(key) >= 3 else None)
+        if phonetic_keys[-1] is not None:
+            keys.append(phonetic_keys[-1])
+
+        for key in keys:
+            members = blocks.get(key)
+            if members is None:
+                blocks[key] = cluster_id  # most blocks never get a second member
+            elif isinstance(members, int):
+                blocks[key] = [members, cluster_id]
+            else:
+                members.append(cluster_id)
+
+    bands = lsh.bands
+    for first in range(len(normalized)):
+        keys = band_keys[first * bands:(first + 1) * bands].tolist()
+        if phonetic_keys[first] is not None:
+            keys.append(phonetic_keys[first])
+
+        # Clusters sharing more blocks are more alike; only later ones, so each pair is seen once
+        shared = Counter()
+        for key in keys:
+            members = blocks[key]
+            if not isinstance(members, int) and len(members) <= MAX_BLOCK_SIZE:
+                shared.update(member for member in members if member > first)
+        if not shared:
+            continue
+
+        for second, _ in shared.most_common(MAX_CANDIDATES):
+            score, reason = similarity(normalized[first], normalized[second],
+                                       not authors[first].isdisjoint(authors[second]), threshold)
+            if score >= threshold:
+                a, b = anchors[first], anchors[second]
+                pairs.append(NearDuplicate(score, reason, titles[a], locations[a], titles[b], locations[b]))
+
+    pairs.sort(key=lambda pair: -pair.score)
+    return pairs
+
+
+def catalog_entries(directory: str = '.') -> Iterable[Tuple[str, Location]]:
+    """(title, location) for every catalog entry."""
+    for file_path, record in iter_catalog_records(directory):
+        yield record.title, Location.at(file_path, record.line_no, record.letter,
+                                        record.entry_number, record.author)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Report near-duplicate titles across the catalog."""
+    parser = argparse.ArgumentParser(description="Find titles that are probably the same book.")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"minimum similarity score to report (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--include-exact', action='store_true',
+                        help="also report exact duplicate titles")
+    args = parser.parse_args(argv)
+
+    print("Near-Duplicate Title Detector")
+    print("=" * 30)
+
+    pairs = find_near_duplicates(catalog_entries(), args.threshold, args.include_exact)
+
+    if not pairs:
+        print("No near-duplicate titles found!")
+        return
+
+    print(f"Found {len(pairs)} near-duplicate pairs:")
+    for pair in pairs:
+        print(f"  {pair.score:.2f} [{pair.reason}] "
+              f"'{pair.title_a}' ({pair.location_a.letter}:{pair.location_a.entry_number}, "
+              f"{pair.location_a.author}) ~ "
+              f"'{pair.title_b}' ({pair.location_b.letter}:{pair.location_b.entry_number}, "
+              f"{pair.location_b.author})")
+
+if __name__ == "__main__":
+    main()
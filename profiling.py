@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Profiling
+Shared --profile option: runs an entry point under cProfile and writes a .pstats
+file plus collapsed stacks (one "caller;callee;... microseconds" line per path)
+that flamegraph.pl, speedscope and similar tools read directly.
+"""
+
+import cProfile
+import os
+import pstats
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Tuple
+
+MAX_STACK_DEPTH = 64
+MIN_PATH_SHARE = 1e-6  # call paths carrying less of a function's time are dropped
+
+
+def add_profile_arguments(parser, script: str) -> None:
+    """Add the shared --profile [PREFIX] option to an entry point."""
+    parser.add_argument('--profile', nargs='?', const=script, default=None, metavar='PREFIX',
+                        help=f"profile the run and write PREFIX.pstats and PREFIX.folded "
+                             f"(default prefix: {script})")
+
+
+def function_label(func: Tuple[str, int, str]) -> str:
+    """Readable frame name for a pstats function key."""
+    filename, line, name = func
+    if filename == '~':
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(';', ',')
+
+
+def collapsed_stacks(stats: pstats.Stats) -> Dict[str, int]:
+    """Rebuild call paths from the pstats caller graph with self time per path.
+
+    cProfile only keeps caller -> callee edges, so a function's self time is
+    split across paths in proportion to the cumulative time of each edge.
+    """
+    entries = stats.stats
+    callees = defaultdict(list)  # caller -> [(callee, cumulative time over that edge)]
+    roots = []
+
+    for func, (_, _, _, _, callers) in entries.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            callees[caller].append((func, edge[3]))
+
+    stacks = Counter()
+    emitted = Counter()  # func -> self time already assigned to some path
+
+    def walk(func, path, on_path, share):
+        self_time = entries[func][2]
+        path = path + (function_label(func),)
+        # Recursive edges overstate cumulative time; never hand out more than tottime
+        amount = min(self_time * share, self_time - emitted[func])
+        if amount > 0:
+            stacks[';'.join(path)] += amount
+            emitted[func] += amount
+
+        if len(path) >= MAX_STACK_DEPTH:
+            return
+
+        on_path = on_path | {func}
+        for callee, edge_time in callees.get(func, ()):
+            callee_time = entries[callee][3]
+            # Recursion is folded into the outermost frame
+            if callee in on_path or callee_time <= 0:
+                continue
+            callee_share = min(1.0, share * edge_time / callee_time)
+            if callee_share >= MIN_PATH_SHARE:
+                walk(callee, path, on_path, callee_share)
+
+    for root in roots:
+        walk(root, (), frozenset(), 1.0)
+
+    return {stack: round(seconds * 1e6) for stack, seconds in stacks.items()
+            if round(seconds * 1e6) > 0}
+
+
+def write_profile(profile: cProfile.Profile, prefix: str) -> None:
+    """Write PREFIX.pstats and PREFIX.folded."""
+    profile.create_stats()
+    stats = pstats.Stats(profile)
+    stats.dump_stats(prefix + '.pstats')
+
+    with open(prefix + '.folded', 'w', encoding='utf-8') as file:
+        for stack, microseconds in sorted(collapsed_stacks(stats).items()):
+            file.write(f"{stack} {microseconds}\n")
+
+    print(f"\nProfile written to {prefix}.pstats and {prefix}.folded")
+
+
+def run_profiled(prefix, func: Callable, *args, **kwargs):
+    """Call func, under cProfile when a profile prefix is given."""
+    if not prefix:
+        return func(*args, **kwargs)
+
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(func, *args, **kwargs)
+    finally:
+        try:
+            write_profile(profile, prefix)
+        except OSError as e:
+            print(f"Error writing profile {prefix}: {e}")
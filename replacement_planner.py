@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Replacement Planner
+Assigns curated replacement books to duplicate entries as a maximum flow, so
+as many duplicates as possible get a curated book without breaking the letter,
+unique-title and unique-author rules; only the rest fall back to filler.
+
+Network: source -> letter (capacity: duplicates to replace in that letter)
+-> title (1) -> candidate (1) -> author (1) -> sink. Every duplicate of a
+letter has the same choices, so letters stand in for individual duplicates
+and the graph stays linear in the number of candidates. A title listed with
+several authors gets one capacity-1 node, so the flow, not the input order,
+decides which author it goes with.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+FILLER_START = 1000
+
+
+class MaxFlow:
+    """Dinic's algorithm; on this unit-capacity layered graph it runs in O(E * sqrt(V))."""
+
+    def __init__(self, nodes: int):
+        self.graph = [[] for _ in range(nodes)]  # node -> [edge ids]
+        self.to = []
+        self.capacity = []
+
+    def add_edge(self, source: int, target: int, capacity: int) -> int:
+        """Add an edge and its residual twin; returns the edge id."""
+        edge = len(self.to)
+        self.graph[source].append(edge)
+        self.to.append(target)
+        self.capacity.append(capacity)
+        self.graph[target].append(edge + 1)
+        self.to.append(source)
+        self.capacity.append(0)
+        return edge
+
+    def flow(self, edge: int) -> int:
+        """Flow carried by an edge added with add_edge."""
+        return self.capacity[edge ^ 1]
+
+    def _levels(self, source: int, sink: int) -> List[int]:
+        level = [-1] * len(self.graph)
+        level[source] = 0
+        queue = deque([source])
+
+        while queue:
+            node = queue.popleft()
+            for edge in self.graph[node]:
+                target = self.to[edge]
+                if self.capacity[edge] and level[target] < 0:
+                    level[target] = level[node] + 1
+                    queue.append(target)
+
+        return level
+
+    def _augment(self, source: int, sink: int, level: List[int], cursor: List[int]) -> int:
+        """Push one unit along a shortest path (iterative DFS so deep graphs never recurse)."""
+        path = []  # edge ids from source
+        node = source
+
+        while node != sink:
+            edges = self.graph[node]
+            while cursor[node] < len(edges):
+                edge = edges[cursor[node]]
+                target = self.to[edge]
+                if self.capacity[edge] and level[target] == level[node] + 1:
+                    break
+                cursor[node] += 1
+            else:
+                # Dead end: retreat and skip the edge that led here
+                if not path:
+                    return 0
+                level[node] = -1
+                edge = path.pop()
+                node = self.to[edge ^ 1]
+                cursor[node] += 1
+                continue
+
+            path.append(edge)
+            node = self.to[edge]
+
+        for edge in path:
+            self.capacity[edge] -= 1
+            self.capacity[edge ^ 1] += 1
+        return 1
+
+    def max_flow(self, source: int, sink: int) -> int:
+        total = 0
+        while True:
+            level = self._levels(source, sink)
+            if level[sink] < 0:
+                return total
+            cursor = [0] * len(self.graph)
+            while self._augment(source, sink, level, cursor):
+                total += 1
+
+
+def plan_replacements(needed: Dict[str, int], candidates: Iterable[Tuple[str, str, str]],
+                      taken_titles: Set[str], taken_authors: Set[str]) -> Dict[str, List[Tuple[str, str]]]:
+    """Pick curated (title, author) replacements per letter, as many as possible.
+
+    needed is {letter: duplicates to replace}; candidates are (letter, title,
+    author) in order of preference. Candidates whose title or author is
+    already taken are skipped, and no title or author is used twice. A title
+    belongs to one letter: if it is listed under several, only the first
+    letter's copies are considered.
+    Returns {letter: [(title, author), ...]} with at most needed[letter] each.
+    """
+    usable = []
+    title_letters = {}  # title -> letter it is filed under
+    for letter, title, author in candidates:
+        if needed.get(letter) and title not in taken_titles and author not in taken_authors \
+                and title_letters.setdefault(title, letter) == letter:
+            usable.append((letter, title, author))
+
+    letters = sorted(needed)
+    titles = list(title_letters)
+    authors = sorted({author for _, _, author in usable})
+    letter_node = {letter: 2 + index for index, letter in enumerate(letters)}
+    title_node = {title: 2 + len(letters) + index for index, title in enumerate(titles)}
+    first_candidate = 2 + len(letters) + len(titles)
+    author_node = {author: first_candidate + len(usable) + index for index, author in enumerate(authors)}
+    source, sink = 0, 1
+
+    network = MaxFlow(first_candidate + len(usable) + len(authors))
+    for letter in letters:
+        network.add_edge(source, letter_node[letter], needed[letter])
+    for title, letter in title_letters.items():
+        network.add_edge(letter_node[letter], title_node[title], 1)
+    picks = []  # (edge id, letter, title, author)
+    for index, (letter, title, author) in enumerate(usable):
+        candidate = first_candidate + index
+        picks.append((network.add_edge(title_node[title], candidate, 1), letter, title, author))
+        network.add_edge(candidate, author_node[author], 1)
+    for author in authors:
+        network.add_edge(author_node[author], sink, 1)
+
+    network.max_flow(source, sink)
+
+    plan = {letter: [] for letter in letters}
+    for edge, letter, title, author in picks:
+        if network.flow(edge):
+            plan[letter].append((title, author))
+    return plan
+
+
+class FillerBooks:
+    """Generic placeholder books whose titles and authors are unused; numbers only go up."""
+
+    def __init__(self, taken_titles: Set[str], taken_authors: Set[str], start: int = FILLER_START):
+        self.taken_titles = taken_titles
+        self.taken_authors = taken_authors
+        self.number = start
+
+    def next(self, letter: str) -> Tuple[str, str]:
+        """A new (title, author) for letter; both are marked taken."""
+        while True:
+            title = f"{letter}venture Quest {self.number}"
+            author = f"Anonymous Author {self.number}"
+            self.number += 1
+            if title not in self.taken_titles and author not in self.taken_authors:
+                self.taken_titles.add(title)
+                self.taken_authors.add(author)
+                return title, author
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Replacement Pool
+Amortized O(1) allocator of unique replacement books drawn from ordered categories.
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Set
+
+
+class LazyCategory:
+    """Sized, re-iterable category whose books are generated on demand."""
+
+    def __init__(self, factory: Callable[[], Iterator[str]], size: int):
+        self.factory = factory
+        self.size = size
+
+    @classmethod
+    def series(cls, subjects: Sequence, templates: List[str]) -> 'LazyCategory':
+        """Every template filled with every subject, subject-major order."""
+        def generate():
+            for subject in subjects:
+                for template in templates:
+                    yield template.format(subject)
+
+        return cls(generate, len(subjects) * len(templates))
+
+    def __iter__(self) -> Iterator[str]:
+        return self.factory()
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class ReplacementPool:
+    def __init__(self, categories: Dict[str, Iterable]):
+        # Categories hold parsed candidates with .title and .author, e.g. from a CandidateStore
+        self.categories = categories
+        self.order = list(categories)
+        self.category_index = 0
+        self.current = None  # iterator over the active category
+        self.consumed = {category: 0 for category in categories}
+
+    def remaining(self) -> int:
+        """Number of candidates not yet allocated or rejected."""
+        return sum(len(books) - self.consumed[category]
+                   for category, books in self.categories.items())
+
+    def allocate(self, used_titles: Set[str], used_authors: Set[str]):
+        """Return the next candidate whose title and author are both unused.
+
+        Rejected candidates are skipped permanently: the used sets only ever
+        grow, so a candidate that conflicts now will conflict forever.
+        Categories are only expanded once the cursor reaches them.
+        """
+        while self.category_index < len(self.order):
+            category = self.order[self.category_index]
+            if self.current is None:
+                self.current = iter(self.categories[category])
+
+            for candidate in self.current:
+                self.consumed[category] += 1
+                if candidate.title not in used_titles and candidate.author not in used_authors:
+                    used_titles.add(candidate.title)
+                    used_authors.add(candidate.author)
+                    return candidate
+
+            self.current = None
+            self.category_index += 1
+
+        return None
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Sketches
+Fixed-memory approximate counters for catalogs too large for exact Counters:
+Count-Min with a candidate heap for the most frequent items and HyperLogLog for
+distinct counts. Sketches built with the same parameters merge, so letter
+shards can be summarised separately and combined.
+"""
+
+import hashlib
+import heapq
+import math
+from array import array
+from typing import Iterable, List, Tuple
+
+DEFAULT_EPSILON = 1e-4  # Count-Min overcount bound, as a share of all items added
+DEFAULT_DELTA = 0.01  # chance an estimate exceeds that bound
+DEFAULT_HLL_PRECISION = 14  # 2**14 registers, ~0.8% standard error
+DEFAULT_TOP_K = 100
+
+HASH_BITS = 64
+
+
+def hash64(item: str) -> int:
+    """Stable 64-bit hash; unlike hash(), identical across processes."""
+    return int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class CountMinSketch:
+    """Frequency estimates that never undercount and overcount by at most
+    epsilon * total with probability 1 - delta."""
+
+    def __init__(self, epsilon: float = DEFAULT_EPSILON, delta: float = DEFAULT_DELTA):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.rows = [array('Q', bytes(8 * self.width)) for _ in range(self.depth)]
+        self.total = 0
+
+    def _columns(self, hashed: int) -> Iterable[int]:
+        # Double hashing: depth indices from one 64-bit hash
+        low, high = hashed & 0xFFFFFFFF, (hashed >> 32) | 1
+        width = self.width
+        return ((low + i * high) % width for i in range(self.depth))
+
+    def add_hashed(self, hashed: int, count: int = 1) -> int:
+        """Add count for a pre-hashed item and return its new estimate."""
+        self.total += count
+        estimate = None
+        for row, column in zip(self.rows, self._columns(hashed)):
+            value = row[column] + count
+            row[column] = value
+            if estimate is None or value < estimate:
+                estimate = value
+        return estimate
+
+    def estimate_hashed(self, hashed: int) -> int:
+        return min(row[column] for row, column in zip(self.rows, self._columns(hashed)))
+
+    def estimate(self, item: str) -> int:
+        return self.estimate_hashed(hash64(item))
+
+    def error_bound(self) -> int:
+        """Largest overcount expected for any item, with probability 1 - delta."""
+        return math.ceil(self.epsilon * self.total)
+
+    def lower_bound(self, estimate: int) -> float:
+        """Smallest true count an estimate is consistent with, with probability 1 - delta."""
+        return estimate - self.epsilon * self.total
+
+    def merge(self, other: 'CountMinSketch') -> None:
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Count-Min sketches differ in width or depth")
+        for row, other_row in zip(self.rows, other.rows):
+            for column, value in enumerate(other_row):
+                if value:
+                    row[column] += value
+        self.total += other.total
+
+
+class HyperLogLog:
+    """Distinct count estimate with a relative standard error of 1.04 / sqrt(2**precision)."""
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add_hashed(self, hashed: int) -> None:
+        index = hashed >> (HASH_BITS - self.precision)
+        rest_bits = HASH_BITS - self.precision
+        rest = hashed & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1  # position of the leftmost 1 bit
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def add(self, item: str) -> None:
+        self.add_hashed(hash64(item))
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small cardinalities: linear counting is more accurate
+            estimate = m * math.log(m / zeros)
+
+        return round(estimate)
+
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        if self.precision != other.precision:
+            raise ValueError("HyperLogLog sketches differ in precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+
+class SketchCounter:
+    """Approximate stand-in for a Counter: top-k items via Count-Min plus a
+    min-heap of candidates, and the number of distinct items via HyperLogLog."""
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K, epsilon: float = DEFAULT_EPSILON,
+                 delta: float = DEFAULT_DELTA, precision: int = DEFAULT_HLL_PRECISION):
+        self.top_k = top_k
+        self.frequencies = CountMinSketch(epsilon, delta)
+        self.distinct = HyperLogLog(precision)
+        self.top = {}  # item -> estimate, at most top_k entries
+        self.heap = []  # (estimate, item); entries no longer matching self.top are stale
+
+    def add(self, item: str, count: int = 1) -> None:
+        hashed = hash64(item)
+        self.distinct.add_hashed(hashed)
+        self._offer(item, self.frequencies.add_hashed(hashed, count))
+
+    def _offer(self, item: str, estimate: int) -> None:
+        top, heap = self.top, self.heap
+
+        if item not in top and len(top) >= self.top_k:
+            # Drop stale heap entries until the root is the true minimum
+            while top.get(heap[0][1]) != heap[0][0]:
+                heapq.heappop(heap)
+            if estimate <= heap[0][0]:
+                return
+            del top[heapq.heappop(heap)[1]]
+
+        top[item] = estimate
+        heapq.heappush(heap, (estimate, item))
+        if len(heap) > 4 * self.top_k:
+            self.heap = [(value, key) for key, value in top.items()]
+            heapq.heapify(self.heap)
+
+    def most_common(self, n: int = None) -> List[Tuple[str, int]]:
+        """Top items by estimated count (never below the true count)."""
+        ranked = sorted(self.top.items(), key=lambda pair: (-pair[1], pair[0]))
+        return ranked if n is None else ranked[:n]
+
+    def unique(self) -> int:
+        return self.distinct.count()
+
+    def merge(self, other: 'SketchCounter') -> None:
+        """Combine with a counter built over other items, e.g. another shard."""
+        self.frequencies.merge(other.frequencies)
+        self.distinct.merge(other.distinct)
+
+        candidates = set(self.top) | set(other.top)
+        self.top, self.heap = {}, []
+        for item in candidates:
+            self._offer(item, self.frequencies.estimate(item))
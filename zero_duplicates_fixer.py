@@ -5,328 +5,115 @@ Absolutely eliminates ALL duplicate books with AI-powered unique book generation
 NO TOLERANCE for duplicates. Every single book will be unique.
 """
 
-import os
-import re
+import argparse
+import asyncio
 import random
-from pathlib import Path
-from collections import defaultdict
-from typing import Dict, List, Set, Tuple
+
+from candidate_store import CandidateStore, add_candidate_arguments, load_candidates
+from catalog_index import DEFAULT_INDEX_FILE, CatalogIndex
+from book_records import FILES, Location
+from catalog_io import add_io_arguments, iter_catalog_reads
+from catalog_parser import catalog_files, iter_file_records
+from catalog_writer import LineEditBatch, apply_replacements_to_index
+from instrumentation import add_metrics_arguments, metrics, write_metrics
+from profiling import add_profile_arguments, run_profiled
+from replacement_pool import ReplacementPool
 
 class ZeroDuplicatesFixer:
-    def __init__(self):
+    def __init__(self, index=None, io_threads=None, candidates=None):
         self.all_books = {}  # title -> [locations]
         self.all_titles_used = set()
         self.all_authors_used = set()
+        self.index = index  # optional persistent CatalogIndex, kept current on flush
+        self.io_threads = io_threads  # read and rewrite files concurrently when set
+        self.pending_edits = LineEditBatch(index, io_threads)
+        self.applied_edits = []  # (old_title, location, new_title, new_author)
+        self.from_index = False  # only duplicated titles are loaded; the index answers the rest
+
+        # Candidates shared with the other fixers; categories are drawn in file order
+        self.candidates = candidates or CandidateStore()
 
-        # Comprehensive database of 1000+ guaranteed unique books by category
-        self.unique_books_database = {
-            'classics': [
-                "War and Peace - Leo Tolstoy",
-                "The Brothers Karamazov - Fyodor Dostoevsky",
-                "Crime and Punishment - Fyodor Dostoevsky",
-                "The Idiot - Fyodor Dostoevsky",
-                "Notes from Underground - Fyodor Dostoevsky",
-                "Dead Souls - Nikolai Gogol",
-                "The Master and Margarita - Mikhail Bulgakov",
-                "Doctor Zhivago - Boris Pasternak",
-                "One Day in the Life of Ivan Denisovich - Aleksandr Solzhenitsyn",
-                "The Gulag Archipelago - Aleksandr Solzhenitsyn",
-                "Fathers and Sons - Ivan Turgenev",
-                "The Cherry Orchard - Anton Chekhov",
-                "Uncle Vanya - Anton Chekhov",
-                "The Seagull - Anton Chekhov",
-                "Three Sisters - Anton Chekhov",
-                "The Death of Ivan Ilyich - Leo Tolstoy",
-                "Resurrection - Leo Tolstoy",
-                "The Kreutzer Sonata - Leo Tolstoy",
-                "A Hero of Our Time - Mikhail Lermontov",
-                "Eugene Onegin - Alexander Pushkin"
-            ],
-            'contemporary_fiction': [
-                "The Kite Runner - Khaled Hosseini",
-                "A Thousand Splendid Suns - Khaled Hosseini",
-                "And the Mountains Echoed - Khaled Hosseini",
-                "The Namesake - Jhumpa Lahiri",
-                "Interpreter of Maladies - Jhumpa Lahiri",
-                "The Lowland - Jhumpa Lahiri",
-                "Life of Pi - Yann Martel",
-                "The Martian - Andy Weir",
-                "Project Hail Mary - Andy Weir",
-                "Artemis - Andy Weir",
-                "Ready Player One - Ernest Cline",
-                "Ready Player Two - Ernest Cline",
-                "Armada - Ernest Cline",
-                "The Fault in Our Stars - John Green",
-                "Looking for Alaska - John Green",
-                "Paper Towns - John Green",
-                "An Abundance of Katherines - John Green",
-                "Will Grayson, Will Grayson - John Green",
-                "Turtles All the Way Down - John Green",
-                "The Anthropocene Reviewed - John Green"
-            ],
-            'mystery_thriller': [
-                "Gone Girl - Gillian Flynn",
-                "Sharp Objects - Gillian Flynn",
-                "Dark Places - Gillian Flynn",
-                "The Girl with the Dragon Tattoo - Stieg Larsson",
-                "The Girl Who Played with Fire - Stieg Larsson",
-                "The Girl Who Kicked the Hornets' Nest - Stieg Larsson",
-                "In the Woods - Tana French",
-                "The Likeness - Tana French",
-                "Faithful Place - Tana French",
-                "Broken Harbor - Tana French",
-                "The Secret Place - Tana French",
-                "The Trespasser - Tana French",
-                "The Witch Elm - Tana French",
-                "The Searcher - Tana French",
-                "Big Little Lies - Liane Moriarty",
-                "The Husband's Secret - Liane Moriarty",
-                "What Alice Forgot - Liane Moriarty",
-                "Nine Perfect Strangers - Liane Moriarty",
-                "Truly Madly Guilty - Liane Moriarty",
-                "Three Wishes - Liane Moriarty"
-            ],
-            'science_fiction': [
-                "Dune - Frank Herbert",
-                "Dune Messiah - Frank Herbert",
-                "Children of Dune - Frank Herbert",
-                "God Emperor of Dune - Frank Herbert",
-                "Heretics of Dune - Frank Herbert",
-                "Chapterhouse: Dune - Frank Herbert",
-                "Foundation - Isaac Asimov",
-                "Foundation and Empire - Isaac Asimov",
-                "Second Foundation - Isaac Asimov",
-                "Foundation's Edge - Isaac Asimov",
-                "Foundation and Earth - Isaac Asimov",
-                "Prelude to Foundation - Isaac Asimov",
-                "Forward the Foundation - Isaac Asimov",
-                "I, Robot - Isaac Asimov",
-                "The Caves of Steel - Isaac Asimov",
-                "The Naked Sun - Isaac Asimov",
-                "The Robots of Dawn - Isaac Asimov",
-                "Robots and Empire - Isaac Asimov",
-                "The Stars, Like Dust - Isaac Asimov",
-                "The Currents of Space - Isaac Asimov"
-            ],
-            'fantasy': [
-                "The Hobbit - J.R.R. Tolkien",
-                "The Fellowship of the Ring - J.R.R. Tolkien",
-                "The Two Towers - J.R.R. Tolkien",
-                "The Return of the King - J.R.R. Tolkien",
-                "The Silmarillion - J.R.R. Tolkien",
-                "Unfinished Tales - J.R.R. Tolkien",
-                "The History of Middle-earth - J.R.R. Tolkien",
-                "A Game of Thrones - George R.R. Martin",
-                "A Clash of Kings - George R.R. Martin",
-                "A Storm of Swords - George R.R. Martin",
-                "A Feast for Crows - George R.R. Martin",
-                "A Dance with Dragons - George R.R. Martin",
-                "The Winds of Winter - George R.R. Martin",
-                "A Dream of Spring - George R.R. Martin",
-                "Fire & Blood - George R.R. Martin",
-                "The World of Ice & Fire - George R.R. Martin",
-                "A Knight of the Seven Kingdoms - George R.R. Martin",
-                "The Princess and the Queen - George R.R. Martin",
-                "The Rogue Prince - George R.R. Martin",
-                "The Sons of the Dragon - George R.R. Martin"
-            ],
-            'literary_fiction': [
-                "Beloved - Toni Morrison",
-                "The Bluest Eye - Toni Morrison",
-                "Song of Solomon - Toni Morrison",
-                "Sula - Toni Morrison",
-                "Tar Baby - Toni Morrison",
-                "Jazz - Toni Morrison",
-                "Paradise - Toni Morrison",
-                "Love - Toni Morrison",
-                "A Mercy - Toni Morrison",
-                "Home - Toni Morrison",
-                "God Help the Child - Toni Morrison",
-                "The Color Purple - Alice Walker",
-                "Meridian - Alice Walker",
-                "The Third Life of Grange Copeland - Alice Walker",
-                "Possessing the Secret of Joy - Alice Walker",
-                "By the Light of My Father's Smile - Alice Walker",
-                "Now Is the Time to Open Your Heart - Alice Walker",
-                "The Temple of My Familiar - Alice Walker",
-                "You Can't Keep a Good Woman Down - Alice Walker",
-                "In Love & Trouble - Alice Walker",
-                "Her Blue Body Everything We Know - Alice Walker"
-            ]
-        }
-
-        # Generate even more unique books using systematic patterns
-        self.generate_systematic_unique_books()
-
-    def generate_systematic_unique_books(self):
-        """Generate thousands of guaranteed unique books using systematic patterns."""
-
-        # Famous historical figures as subjects
-        historical_figures = [
-            "Napoleon Bonaparte", "Alexander the Great", "Julius Caesar", "Cleopatra",
-            "Leonardo da Vinci", "Michelangelo", "Galileo Galilei", "Isaac Newton",
-            "Albert Einstein", "Marie Curie", "Charles Darwin", "Nikola Tesla",
-            "Benjamin Franklin", "George Washington", "Abraham Lincoln", "Winston Churchill",
-            "Martin Luther King Jr.", "Gandhi", "Nelson Mandela", "Theodore Roosevelt"
-        ]
-
-        # Academic subjects and fields
-        academic_fields = [
-            "Quantum Physics", "Molecular Biology", "Ancient History", "Modern Philosophy",
-            "Computational Mathematics", "Cognitive Psychology", "Environmental Science", "Neuroscience",
-            "Astrophysics", "Biochemistry", "Political Theory", "Anthropology",
-            "Sociology", "Economics", "Linguistics", "Archaeology"
-        ]
-
-        # Generate biographical series
-        bio_books = []
-        for figure in historical_figures:
-            bio_books.extend([
-                f"The Life and Times of {figure} - Academic Press",
-                f"Understanding {figure} - Historical Society",
-                f"The Legacy of {figure} - Biography Institute",
-                f"Secrets of {figure} - Research Foundation",
-                f"The Complete {figure} - Historical Review"
-            ])
-
-        # Generate academic series
-        academic_books = []
-        for field in academic_fields:
-            academic_books.extend([
-                f"Introduction to {field} - University Press",
-                f"Advanced {field} - Academic Publications",
-                f"Modern {field} Theory - Research Institute",
-                f"Foundations of {field} - Educational Press",
-                f"Contemporary {field} - Scholarly Works"
-            ])
-
-        # Generate geographical exploration books
-        countries = [
-            "Japan", "Brazil", "Egypt", "Iceland", "Peru", "Thailand", "Morocco", "Australia",
-            "Norway", "India", "Argentina", "Kenya", "Turkey", "Vietnam", "Chile", "Greece"
-        ]
-
-        geo_books = []
-        for country in countries:
-            geo_books.extend([
-                f"Journey Through {country} - Travel Press",
-                f"Hidden Treasures of {country} - Explorer Publications",
-                f"The Culture of {country} - Anthropological Studies",
-                f"Modern {country} - Contemporary Analysis",
-                f"Ancient {country} - Historical Exploration"
-            ])
-
-        # Generate scientific discovery books
-        discoveries = [
-            "Penicillin", "DNA Structure", "Relativity Theory", "Quantum Mechanics",
-            "Evolution", "Gravity", "Electricity", "Radioactivity", "Photography", "Telegraph"
-        ]
-
-        discovery_books = []
-        for discovery in discoveries:
-            discovery_books.extend([
-                f"The Discovery of {discovery} - Science Press",
-                f"Understanding {discovery} - Scientific Publications",
-                f"The Impact of {discovery} - Research Studies",
-                f"Modern Applications of {discovery} - Technology Review",
-                f"The History of {discovery} - Scientific Heritage"
-            ])
-
-        # Add all generated books to database
-        self.unique_books_database['biographical'] = bio_books
-        self.unique_books_database['academic'] = academic_books
-        self.unique_books_database['geographical'] = geo_books
-        self.unique_books_database['scientific'] = discovery_books
-
-        # Generate numbered series for absolute uniqueness
-        numbered_series = []
-        for i in range(1, 1001):  # Generate 1000 numbered books
-            numbered_series.append(f"Chronicles of Knowledge Volume {i} - Educational Series")
-            numbered_series.append(f"World Literature Collection {i} - Literary Press")
-            numbered_series.append(f"Historical Documents Series {i} - Archive Publications")
-            numbered_series.append(f"Scientific Discoveries {i} - Research Compendium")
-            numbered_series.append(f"Cultural Studies {i} - Anthropological Press")
-
-        self.unique_books_database['numbered_series'] = numbered_series
-
-    def load_all_books(self):
+        # Cursor per category for O(1) allocation
+        self.replacement_pool = ReplacementPool(self.candidates.categories)
+
+    def load_all_books(self, use_index=True):
         """Load all current books and track duplicates."""
-        current_dir = Path('.')
+        if use_index and self.index is not None:
+            self.load_books_from_index()
+            return
 
-        for letter in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
-            file_path = current_dir / f'books_{letter}.md'
-            if file_path.exists():
-                self.load_books_from_file(str(file_path))
+        if self.io_threads:
+            asyncio.run(self.load_all_books_async())
+            return
 
-    def load_books_from_file(self, filepath):
+        for letter, file_path in catalog_files():
+            self.load_books_from_file(str(file_path), letter)
+
+    async def load_all_books_async(self):
+        """Load all books from the files, reading them concurrently in worker threads."""
+        async for letter, filepath, pending in iter_catalog_reads(threads=self.io_threads):
+            try:
+                self.add_records(filepath, await pending)
+            except Exception as e:
+                print(f"Error loading {filepath}: {e}")
+
+    def load_books_from_index(self):
+        """Load the duplicated titles from the persistent index, reparsing only changed files.
+
+        Every other title and author stays in the index and is checked with
+        point queries.
+        """
+        self.index.refresh()
+        self.from_index = True
+        self.all_books = self.index.duplicates()
+        self.all_titles_used = self.index.taken_titles()
+        self.all_authors_used = self.index.taken_authors()
+
+    def title_count(self):
+        """Number of distinct titles loaded."""
+        return self.index.title_count() if self.from_index else len(self.all_books)
+
+    def load_books_from_file(self, filepath, letter=None):
         """Load books from a single file."""
-        filename = os.path.basename(filepath)
-        letter = filename.replace('books_', '').replace('.md', '')
-
         try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
-
-                for line_num, line in enumerate(lines, 1):
-                    line = line.strip()
-
-                    if re.match(r'^\d+\.', line):
-                        match = re.match(r'^(\d+)\.\s+(.+?)\s+-\s+(.+)$', line)
-                        if match:
-                            number, title, author = match.groups()
-                            title = title.strip()
-                            author = author.strip()
-
-                            # Track all titles and authors
-                            self.all_titles_used.add(title)
-                            self.all_authors_used.add(author)
-
-                            if title not in self.all_books:
-                                self.all_books[title] = []
-
-                            self.all_books[title].append({
-                                'file': filepath,
-                                'line_number': line_num,
-                                'letter': letter,
-                                'entry_number': int(number),
-                                'author': author,
-                                'original_line': line
-                            })
-
+            self.add_records(filepath, iter_file_records(filepath, letter))
         except Exception as e:
             print(f"Error loading {filepath}: {e}")
 
+    def add_records(self, filepath, records):
+        """Track the parsed entries of one file."""
+        file_id = FILES.id_for(filepath)
+
+        for record in records:
+            # Track all titles and authors
+            self.all_titles_used.add(record.title)
+            self.all_authors_used.add(record.author)
+
+            if record.title not in self.all_books:
+                self.all_books[record.title] = []
+
+            self.all_books[record.title].append(
+                Location(file_id, record.line_no, record.letter, record.entry_number, record.author))
+
     def find_all_duplicates(self):
         """Find ALL duplicate titles."""
         return {title: locations for title, locations in self.all_books.items()
                 if len(locations) > 1}
 
     def get_next_unique_book(self):
-        """Get the next guaranteed unique book."""
-        # Try each category in order
-        for category, books in self.unique_books_database.items():
-            for book in books:
-                if " - " in book:
-                    title = book.split(" - ")[0].strip()
-                    author = book.split(" - ")[1].strip()
-
-                    # Check if this title and author are completely unique
-                    if (title not in self.all_titles_used and
-                        author not in self.all_authors_used):
-
-                        # Mark as used
-                        self.all_titles_used.add(title)
-                        self.all_authors_used.add(author)
-
-                        # Remove from database so it won't be used again
-                        books.remove(book)
-
-                        return book
+        """Get the next guaranteed unique book as (title, author)."""
+        # Take the next candidate from the pool, categories in order
+        candidate = self.replacement_pool.allocate(self.all_titles_used, self.all_authors_used)
+        if candidate:
+            return candidate.title, candidate.author
 
         # Fallback: generate absolutely unique book with timestamp
         import time
         unique_id = int(time.time() * 1000) + random.randint(1000, 9999)
-        unique_book = f"Unique Academic Study {unique_id} - Research Scholar {unique_id}"
+        # Allocation is fast enough to draw the same id twice; retry until unused
+        while (f"Unique Academic Study {unique_id}" in self.all_titles_used or
+               f"Research Scholar {unique_id}" in self.all_authors_used):
+            unique_id += random.randint(1, 9999)
 
         title = f"Unique Academic Study {unique_id}"
         author = f"Research Scholar {unique_id}"
@@ -334,28 +121,18 @@ class ZeroDuplicatesFixer:
         self.all_titles_used.add(title)
         self.all_authors_used.add(author)
 
-        return unique_book
+        return title, author
 
     def update_file_line(self, filepath, line_number, new_line):
-        """Update a specific line in a file."""
-        try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
-
-            if 1 <= line_number <= len(lines):
-                lines[line_number - 1] = new_line + '\n'
-
-                with open(filepath, 'w', encoding='utf-8') as file:
-                    file.writelines(lines)
-                return True
-
-        except Exception as e:
-            print(f"Error updating {filepath}: {e}")
-            return False
+        """Queue an update of a specific line; written when the batch is flushed."""
+        self.pending_edits.stage(filepath, line_number, new_line)
+        return True
 
     def eliminate_all_duplicates(self):
         """Eliminate ALL duplicates with zero tolerance."""
-        duplicates = self.find_all_duplicates()
+        with metrics.phase('detect'):
+            duplicates = self.find_all_duplicates()
+        metrics.count('duplicate_titles', len(duplicates))
 
         if not duplicates:
             print("No duplicates found!")
@@ -364,35 +141,56 @@ class ZeroDuplicatesFixer:
         print(f"ELIMINATING ALL {len(duplicates)} DUPLICATE TITLES...")
         total_replaced = 0
 
-        for title, locations in duplicates.items():
-            print(f"\nFixing '{title}' ({len(locations)} occurrences)")
+        with metrics.phase('replace'):
+            for title, locations in duplicates.items():
+                print(f"\nFixing '{title}' ({len(locations)} occurrences)")
 
-            # Keep first occurrence, replace all others
-            locations_to_replace = locations[1:]
+                # Keep first occurrence, replace all others
+                locations_to_replace = locations[1:]
 
-            for i, location in enumerate(locations_to_replace):
-                unique_book = self.get_next_unique_book()
-                new_line = f"{location['entry_number']}. {unique_book}"
+                for i, location in enumerate(locations_to_replace):
+                    new_title, new_author = self.get_next_unique_book()
+                    new_line = f"{location.entry_number}. {new_title} - {new_author}"
 
-                if self.update_file_line(location['file'], location['line_number'], new_line):
-                    new_title = unique_book.split(" - ")[0].strip()
-                    print(f"  [{i+1}/{len(locations_to_replace)}] {location['letter']} -> '{new_title}'")
-                    total_replaced += 1
-                else:
-                    print(f"  FAILED to replace in {location['letter']}")
+                    if self.update_file_line(location.file, location.line_number, new_line):
+                        print(f"  [{i+1}/{len(locations_to_replace)}] {location.letter} -> '{new_title}'")
+                        self.applied_edits.append((title, location, new_title, new_author))
+                        total_replaced += 1
+                    else:
+                        print(f"  FAILED to replace in {location.letter}")
+
+        # Write every touched file once; only edits that reached disk count
+        written = self.pending_edits.flush()
+        total_replaced = sum(map(len, written.values()))
+        metrics.count('lines_replaced', total_replaced)
+        self.applied_edits = [edit for edit in self.applied_edits
+                              if edit[1].line_number in written.get(edit[1].file, ())]
 
         print(f"\n=== REPLACEMENT COMPLETE ===")
         print(f"Total duplicates eliminated: {total_replaced}")
+        print(f"Replacement candidates left: {self.replacement_pool.remaining()}")
+
+    def verify_zero_duplicates(self, paranoid=False):
+        """Verify absolutely zero duplicates remain.
 
-    def verify_zero_duplicates(self):
-        """Verify absolutely zero duplicates remain."""
+        By default the in-memory index is updated with the edits made by
+        eliminate_all_duplicates; paranoid mode reparses every file instead.
+        """
         print("\n=== VERIFICATION PHASE ===")
 
-        # Reload all books
-        self.all_books = {}
-        self.all_titles_used = set()
-        self.all_authors_used = set()
-        self.load_all_books()
+        if paranoid:
+            # Reload all books straight from the files
+            self.all_books = {}
+            self.all_titles_used = set()
+            self.all_authors_used = set()
+            self.from_index = False
+            self.load_all_books(use_index=False)
+        elif self.from_index:
+            # Flushed edits are already in the index
+            self.all_books = self.index.duplicates()
+        else:
+            apply_replacements_to_index(self.all_books, self.applied_edits)
+        self.applied_edits = []
 
         # Check for any remaining duplicates
         duplicates = self.find_all_duplicates()
@@ -404,25 +202,32 @@ class ZeroDuplicatesFixer:
             return False
         else:
             print("SUCCESS: ZERO DUPLICATES CONFIRMED!")
-            print(f"All {len(self.all_titles_used)} books are completely unique!")
+            print(f"All {self.title_count()} books are completely unique!")
             return True
 
-def main():
+def run(args):
+    """Eliminate duplicates with parsed command-line arguments."""
     print("=" * 60)
     print("ZERO DUPLICATES FIXER - NO TOLERANCE FOR DUPLICATES")
     print("=" * 60)
 
-    fixer = ZeroDuplicatesFixer()
+    candidates = load_candidates(args.candidates)
+    if candidates is None:
+        return
+
+    fixer = ZeroDuplicatesFixer(CatalogIndex(args.index) if args.index else None, args.io_threads, candidates)
 
     print("Phase 1: Loading all books...")
-    fixer.load_all_books()
-    print(f"Loaded {len(fixer.all_books)} unique titles")
+    with metrics.phase('load'):
+        fixer.load_all_books()
+    print(f"Loaded {fixer.title_count()} unique titles")
 
     print("\nPhase 2: Eliminating ALL duplicates...")
     fixer.eliminate_all_duplicates()
 
     print("\nPhase 3: Final verification...")
-    success = fixer.verify_zero_duplicates()
+    with metrics.phase('verify'):
+        success = fixer.verify_zero_duplicates(paranoid=args.paranoid)
 
     if success:
         print("\n" + "=" * 60)
@@ -432,5 +237,21 @@ def main():
     else:
         print("\nERROR: Duplicates still exist. Manual intervention required.")
 
+    write_metrics(args, 'zero_duplicates_fixer')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Eliminate ALL duplicate books with zero tolerance.")
+    parser.add_argument('--paranoid', action='store_true',
+                        help="reparse every file during verification instead of trusting the edit log")
+    parser.add_argument('--index', nargs='?', const=DEFAULT_INDEX_FILE, default=None, metavar='PATH',
+                        help=f"load from and update a persistent title index (default path: {DEFAULT_INDEX_FILE})")
+    add_candidate_arguments(parser)
+    add_io_arguments(parser)
+    add_metrics_arguments(parser)
+    add_profile_arguments(parser, 'zero_duplicates_fixer')
+    args = parser.parse_args(argv)
+
+    run_profiled(args.profile, run, args)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file